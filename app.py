@@ -9,54 +9,97 @@ import os
 import uuid
 import time
 import tempfile
-import re
-from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, send_file, render_template
+import math
+import mmap
+from datetime import timedelta
+from flask import Flask, Response, request, jsonify, send_file, render_template
 from flask_cors import CORS
 import threading
-import hashlib
-from typing import Optional, Dict, Any
+import queue
+import shutil
+import gzip
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import secrets
+from functools import lru_cache
+from typing import Optional, Dict, Any, Set, Union
+
+try:
+    import orjson  # Optional: faster serialization of the large analysis dicts
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 CORS(app)
+logger = logging.getLogger(__name__)
+# Behind nginx/apache, let the front server stream downloads via X-Sendfile
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', '') == '1'
+
+# Sorted keys to match jsonify's output
+_ORJSON_OPTIONS = orjson.OPT_SORT_KEYS if orjson is not None else 0
 
-# UUID validation regex pattern (strict)
-UUID_PATTERN = re.compile(
-    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
-    re.IGNORECASE
-)
+def _json_response(obj: Any) -> Response:
+    """Serialize obj as a JSON response, using orjson when it is installed."""
+    if orjson is None:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj, option=_ORJSON_OPTIONS), mimetype='application/json')
+
+# Every byte value except ASCII hex digits, deleted by bytes.translate
+_NON_HEX_BYTES = bytes(i for i in range(256) if i not in b'0123456789abcdefABCDEF')
 
 def validate_uuid(uuid_str: str) -> bool:
     """Strictly validate UUID format."""
     if not uuid_str or not isinstance(uuid_str, str):
         return False
     uuid_str = uuid_str.strip()
-    # Check regex pattern
-    if not UUID_PATTERN.match(uuid_str):
+    # Canonical layout: 36 ASCII chars with hyphens at fixed positions
+    if len(uuid_str) != 36 or not uuid_str.isascii():
         return False
-    # Also validate with uuid module
-    try:
-        uuid.UUID(uuid_str)
-        return True
-    except (ValueError, AttributeError):
+    b = uuid_str.encode('ascii')
+    if (b[8], b[13], b[18], b[23]) != (0x2d, 0x2d, 0x2d, 0x2d):
         return False
+    # Deleting non-hex bytes must leave exactly the 32 non-hyphen characters
+    return len(b.translate(None, _NON_HEX_BYTES)) == 32
+
+def parse_uuid(uuid_str: str) -> Optional[uuid.UUID]:
+    """Strictly validate UUID format and return the parsed UUID, or None if invalid."""
+    if not validate_uuid(uuid_str):
+        return None
+    return uuid.UUID(uuid_str.strip())
+
+# Range endpoints must be version 1 UUIDs; set ALLOW_NON_V1_RANGES=1 to accept any version nibble
+ALLOW_NON_V1_RANGES = os.getenv('ALLOW_NON_V1_RANGES', '') == '1'
+
+def is_valid_range_endpoint(uuid_obj: uuid.UUID) -> bool:
+    """Check the version nibble (the range's save_char) is 1, unless non-v1 ranges are allowed."""
+    return ALLOW_NON_V1_RANGES or (uuid_obj.int >> 76) & 0xf == 1
+
+# Characters rejected in text input: HTML/quote characters plus control characters (C0 range and DEL),
+# as a str.translate deletion table
+_BAD_CHARS = frozenset(range(0, 32)) | {127, ord('<'), ord('>'), ord('"'), ord("'")}
+_DEL_TABLE = dict.fromkeys(_BAD_CHARS, None)
+
+# Surrounding whitespace allowed on top of max_length before validate_text_input stops caching
+_TEXT_CACHE_MARGIN = 16
+
+def _check_text_input(text: str, max_length: int) -> bool:
+    """Body of validate_text_input for a non-empty str."""
+    text = text.strip()
+    # Anything deleted by the table means a rejected character was present
+    return bool(text and len(text) <= max_length and len(text.translate(_DEL_TABLE)) == len(text))
+
+_validate_text_input_cached = lru_cache(maxsize=4096)(_check_text_input)
 
 def validate_text_input(text: str, max_length: int = 1000) -> bool:
     """Validate text input - only allow safe text characters."""
     if not text or not isinstance(text, str):
         return False
-    text = text.strip()
-    # Check length
-    if len(text) == 0 or len(text) > max_length:
-        return False
-    # Allow alphanumeric, spaces, and common safe characters
-    # Block potentially dangerous characters
-    if re.search(r'[<>"\']', text):
-        return False
-    # Allow printable characters except control characters
-    if not all(ord(c) >= 32 and ord(c) != 127 for c in text):
-        return False
-    return True
+    if len(text) > max_length + _TEXT_CACHE_MARGIN:
+        # Oversized input is checked (and most likely rejected) without entering the cache
+        return _check_text_input(text, max_length)
+    return _validate_text_input_cached(text, max_length)
 
 def validate_version(version: str) -> bool:
     """Validate UUID version string."""
@@ -66,46 +109,224 @@ def validate_namespace(namespace: str) -> bool:
     """Validate namespace string."""
     return namespace.upper() in ['DNS', 'URL', 'OID', 'X500']
 
+# Longest custom namespace accepted for v3 analysis
+MAX_NAMESPACE_LENGTH = 256
+
+def validate_namespace_input(namespace: Any) -> bool:
+    """Validate the optional analysis namespace: absent, or a string of at most MAX_NAMESPACE_LENGTH."""
+    return namespace is None or (isinstance(namespace, str) and len(namespace) <= MAX_NAMESPACE_LENGTH)
+
+# English day/month names for the friendly format (what strftime's %A/%B give in the C locale)
+_WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTH_NAMES = ('', 'January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December')
+_IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+
+def _split_timestamp(timestamp: float) -> tuple:
+    """Split a Unix timestamp into whole seconds and microseconds, rounding like datetime does."""
+    frac, whole = math.modf(timestamp)
+    micros = round(frac * 1e6)
+    if micros >= 1000000:
+        whole += 1
+        micros -= 1000000
+    elif micros < 0:
+        whole -= 1
+        micros += 1000000
+    return int(whole), micros
+
+def _format_timestamp_fields(seconds: int, micros: int) -> tuple:
+    """Return (isoformat, date, time, friendly) strings for a UTC second count."""
+    gm = time.gmtime(seconds)
+    date_str = f"{gm.tm_year:04d}-{gm.tm_mon:02d}-{gm.tm_mday:02d}"
+    hms = f"{gm.tm_hour:02d}:{gm.tm_min:02d}:{gm.tm_sec:02d}"
+    iso_str = f"{date_str}T{hms}.{micros:06d}" if micros else f"{date_str}T{hms}"
+    time_str = f"{hms}.{micros // 1000:03d}"
+    friendly = (f"{_WEEKDAY_NAMES[gm.tm_wday]}, {_MONTH_NAMES[gm.tm_mon]} {gm.tm_mday:02d}, {gm.tm_year} "
+                f"at {gm.tm_hour % 12 or 12:02d}:{gm.tm_min:02d}:{gm.tm_sec:02d} {'PM' if gm.tm_hour >= 12 else 'AM'}")
+    return iso_str, date_str, time_str, friendly
+
+def _uuid_v1_int(timestamp: float, node: int) -> int:
+    """Build the 128-bit integer value of a UUID v1 for a Unix timestamp and 48-bit node."""
+    # Convert Unix timestamp to UUID timestamp (100-nanosecond intervals since UUID epoch)
+    uuid_timestamp = int((timestamp + 12219292800) * 10000000)
+    
+    # Extract 60-bit timestamp components
+    time_low = uuid_timestamp & 0xffffffff      # 32 bits
+    rest = uuid_timestamp >> 32
+    time_mid = rest & 0xffff                    # 16 bits
+    
+    # 12 bits of time_hi with version (1) added
+    time_hi_version = ((rest >> 16) & 0x0fff) | 0x1000
+    
+    # Generate unique clock sequence for each timestamp to ensure uniqueness
+    # Use a combination of timestamp and a counter to make it unique
+    micro_ts = int(timestamp * 1000000)
+    clock_seq_low = micro_ts & 0xff  # Use microseconds part
+    clock_seq_high = ((micro_ts >> 8) & 0x3f) | 0x80  # Add variant bits
+    
+    # Assemble the integer directly instead of going through fields= validation
+    return ((time_low << 96) | (time_mid << 80) | (time_hi_version << 64) |
+            (clock_seq_high << 56) | (clock_seq_low << 48) | node)
+
+def _extract_ts_and_tail(u: uuid.UUID) -> tuple:
+    """Return (60-bit timestamp, clock_seq hex, mac hex, save_char) for a UUID v1."""
+    i = u.int
+    # time_hi (version nibble masked off) + time_mid + time_low, like the Ruby high + mid + low
+    timestamp_hex = (((i >> 64) & 0x0fff) << 48) | (((i >> 80) & 0xffff) << 32) | (i >> 96)
+    h = u.hex
+    # clock_seq_hi + clock_seq_low, node, and the version nibble kept as save_char
+    return timestamp_hex, h[16:20], h[20:32], h[12]
+
+def _parse_range(start_uuid: Union[str, uuid.UUID], end_uuid: Union[str, uuid.UUID]) -> tuple:
+    """Parse range endpoints into (start_ts, end_ts, clock_seq, mac_address, save_char).
+
+    Endpoints may be strings or already-parsed UUIDs (as passed by the routes).
+    Timestamps are returned in ascending order; clock_seq, mac and save_char come from start_uuid.
+    """
+    if not isinstance(start_uuid, uuid.UUID):
+        start_uuid = uuid.UUID(start_uuid)
+    if not isinstance(end_uuid, uuid.UUID):
+        end_uuid = uuid.UUID(end_uuid)
+    start_timestamp_hex, clock_seq, mac_address, save_char = _extract_ts_and_tail(start_uuid)
+    end_timestamp_hex = _extract_ts_and_tail(end_uuid)[0]
+    if start_timestamp_hex > end_timestamp_hex:
+        start_timestamp_hex, end_timestamp_hex = end_timestamp_hex, start_timestamp_hex
+    return start_timestamp_hex, end_timestamp_hex, clock_seq, mac_address, save_char
+
+# All 4-digit lowercase hex strings, indexed by value (the low 16 bits of time_low)
+_HEX4 = tuple(f"{i:04x}" for i in range(0x10000))
+
+# Bytes per line in generated range files: 36-char UUID plus newline
+UUID_LINE_WIDTH = 37
+
+# UUIDs formatted and written per chunk by the range writers; cancellation and
+# progress are checked once per chunk. Matches the _HEX4 block size.
+RANGE_CHUNK_SIZE = 1 << 16
+
+# Userspace buffer for generated files, large enough to hold several chunks
+WRITE_BUFFER_SIZE = 8 << 20
+
+def _format_range_chunk(start_ts: int, end_ts: int, save_char: str, tail: str) -> str:
+    """Format the UUID lines for timestamps [start_ts, end_ts) as one string.
+
+    Same layout as generate_uuid_v1_custom: time_low-time_mid-save_char+time_hi<tail>.
+    Inside a 2**16-aligned block only the last 4 hex digits of time_low change, so
+    each block is one str.join of _HEX4 entries with the constant parts as separator.
+    """
+    parts = []
+    ts = start_ts
+    while ts < end_ts:
+        block_end = min(end_ts, (ts | 0xffff) + 1)
+        h = f"{ts:015x}"
+        prefix = h[7:11]
+        rest = "-" + h[3:7] + "-" + save_char + h[0:3] + tail
+        low = ts & 0xffff
+        parts.append(prefix + (rest + prefix).join(_HEX4[low:low + block_end - ts]) + rest)
+        ts = block_end
+    return "".join(parts)
+
+# Per-version field descriptions, built once at import
+_VERSION_DESC: Dict[int, str] = {
+    1: 'Time-based UUID using timestamp and MAC address',
+    2: 'DCE Security UUID (time-based + POSIX UID/GID)',
+    3: 'Name-based UUID using MD5 hash',
+    4: 'Random UUID (cryptographically secure)',
+    5: 'Name-based UUID using SHA-1 hash'
+}
+
+_NODE_DESC: Dict[int, str] = {
+    1: 'MAC address of the generating computer',
+    2: 'MAC address with POSIX UID/GID',
+    3: 'MD5 hash output (48 bits) - part of the hash result, not a MAC address',
+    4: 'Randomly generated (not a real MAC address)',
+    5: 'SHA-1 hash output (48 bits) - part of the hash result, not a MAC address'
+}
+
+_CLOCK_SEQ_DESC: Dict[int, str] = {
+    1: 'Random or pseudo-random number to ensure uniqueness',
+    2: 'Security domain identifier',
+    3: 'MD5 hash output (14 bits) - part of the hash result, not a clock sequence',
+    4: 'Randomly generated (not used for timing)',
+    5: 'SHA-1 hash output (14 bits) - part of the hash result, not a clock sequence'
+}
+
+# Base-field overrides for versions whose time/clock/node fields carry no time/clock/node meaning
+_NON_TIME_BASE_FIELDS: Dict[int, Dict[str, str]] = {
+    3: {
+        'friendly_utc': 'N/A - UUID v3 is name-based, not time-based',
+        'friendly_ist': 'N/A - UUID v3 is name-based, not time-based',
+        'timezone_utc': 'N/A',
+        'timezone_ist': 'N/A',
+        'node_desc': 'MD5 hash component (48 bits) - not a MAC address',
+        'clock_seq_desc': 'MD5 hash component (14 bits) - not a clock sequence',
+        'note_time_fields': 'Fields named "time_low", "time_mid", "time_hi" are MD5 hash components, not timestamps',
+        'note_clock_node': 'Fields named "clock_seq" and "node" are MD5 hash components, not clock sequence or MAC address'
+    },
+    4: {
+        'friendly_utc': 'N/A - UUID v4 is random, not time-based',
+        'friendly_ist': 'N/A - UUID v4 is random, not time-based',
+        'timezone_utc': 'N/A',
+        'timezone_ist': 'N/A',
+        'node_desc': 'Random bits (48 bits) - not a MAC address',
+        'clock_seq_desc': 'Random bits (14 bits) - not a clock sequence',
+        'note_time_fields': 'Fields named "time_low", "time_mid", "time_hi" are random bits, not timestamps',
+        'note_clock_node': 'Fields named "clock_seq" and "node" are random bits, not clock sequence or MAC address'
+    }
+}
+
+# Well-known UUID v3/v5 namespaces, with their UUID strings precomputed
+_NAMESPACE_UUIDS: Dict[str, uuid.UUID] = {
+    'DNS': uuid.NAMESPACE_DNS,
+    'URL': uuid.NAMESPACE_URL,
+    'OID': uuid.NAMESPACE_OID,
+    'X500': uuid.NAMESPACE_X500
+}
+
+_NAMESPACE_INFO: Dict[str, Dict[str, str]] = {
+    'DNS': {
+        'uuid': str(uuid.NAMESPACE_DNS),
+        'description': 'Domain Name System (DNS) - for domain names',
+        'example': 'example.com'
+    },
+    'URL': {
+        'uuid': str(uuid.NAMESPACE_URL),
+        'description': 'Uniform Resource Locator (URL) - for URLs',
+        'example': 'https://example.com/page'
+    },
+    'OID': {
+        'uuid': str(uuid.NAMESPACE_OID),
+        'description': 'ISO Object Identifier (OID) - for ISO OIDs',
+        'example': '1.3.6.1.4.1'
+    },
+    'X500': {
+        'uuid': str(uuid.NAMESPACE_X500),
+        'description': 'X.500 Distinguished Name (DN) - for X.500 DNs',
+        'example': 'CN=John Doe, OU=Engineering, O=Company'
+    }
+}
+
 class UUIDv1Generator:
     """UUID Version 1 Generator with range functionality."""
     
-    def __init__(self):
-        self.node = uuid.getnode()  # Get MAC address
+    # MAC address, looked up once per process rather than per instance
+    node = uuid.getnode()
     
     def generate_uuid_v1(self, timestamp: Optional[float] = None) -> uuid.UUID:
         """Generate a UUID version 1."""
         if timestamp is not None:
             # Generate UUID at specific timestamp
-            # Convert Unix timestamp to UUID timestamp (100-nanosecond intervals since UUID epoch)
-            uuid_timestamp = int((timestamp + 12219292800) * 10000000)
-            
-            # Extract 60-bit timestamp components
-            time_low = uuid_timestamp & 0xffffffff      # 32 bits
-            time_mid = (uuid_timestamp >> 32) & 0xffff # 16 bits
-            time_hi = (uuid_timestamp >> 48) & 0x0fff  # 12 bits
-            
-            # Add version (1) to time_hi
-            time_hi_version = time_hi | (1 << 12)
-            
-            # Generate unique clock sequence for each timestamp to ensure uniqueness
-            # Use a combination of timestamp and a counter to make it unique
-            import time as time_module
-            clock_seq_low = (int(timestamp * 1000000) & 0xff)  # Use microseconds part
-            clock_seq_high = ((int(timestamp * 1000000) >> 8) & 0x3f) | 0x80  # Add variant bits
-            
-            node = self.node
-            
-            # Create UUID with specified timestamp
-            return uuid.UUID(fields=(time_low, time_mid, time_hi_version, clock_seq_high, clock_seq_low, node))
+            return uuid.UUID(int=_uuid_v1_int(timestamp, self.node))
         else:
             # Use standard Python UUID v1 generation which handles clock sequence properly
             return uuid.uuid1(node=self.node)
     
     def uuid_to_timestamp(self, uuid_obj: uuid.UUID) -> float:
         """Extract timestamp from UUID v1."""
-        time_low = uuid_obj.fields[0]
-        time_mid = uuid_obj.fields[1]
-        time_hi_version = uuid_obj.fields[2] & 0x0fff
+        # Shift straight out of the 128-bit int; .fields rebuilds a tuple on every access
+        i = uuid_obj.int
+        time_low = (i >> 96) & 0xffffffff
+        time_mid = (i >> 80) & 0xffff
+        time_hi_version = (i >> 64) & 0x0fff
         
         uuid_time = (time_hi_version << 48) | (time_mid << 32) | time_low
         # Convert from 100-nanosecond intervals to seconds since UUID epoch
@@ -116,9 +337,31 @@ class UUIDv1Generator:
         
         return timestamp
     
-    def analyze_uuid(self, uuid_str: str, namespace: Optional[str] = None) -> Dict[str, Any]:
+    def analyze_uuid(self, uuid_str: Union[str, uuid.UUID], namespace: Optional[str] = None,
+                     cache: bool = True) -> Dict[str, Any]:
+        """Analyze a UUID (string or already-parsed object), memoizing the result per (uuid, namespace).
+
+        Pass cache=False for UUIDs that will not be seen again, such as freshly generated ones.
+        """
+        if not cache or not isinstance(uuid_str, (str, uuid.UUID)):
+            return self._analyze_uuid_impl(uuid_str, namespace)
+        try:
+            uuid_obj = uuid_str if isinstance(uuid_str, uuid.UUID) else uuid.UUID(uuid_str)
+        except ValueError:
+            return {'error': 'Invalid UUID format'}
+        if uuid_obj.version != 3:
+            # Only v3 analysis reads the namespace, so it is not part of other keys
+            namespace = None
+        elif namespace is not None and not (isinstance(namespace, str) and validate_namespace(namespace)):
+            # Custom, oversized or unhashable namespaces are analyzed without caching
+            return self._analyze_uuid_impl(uuid_obj, namespace)
+        # Copy so callers can add fields without touching the cached result
+        return dict(self._analyze_uuid_cached(uuid_obj, namespace))
+    
+    def _analyze_uuid_impl(self, uuid_str: Union[str, uuid.UUID], namespace: Optional[str] = None) -> Dict[str, Any]:
+        """Build the analysis dict for a UUID (uncached)."""
         try:
-            uuid_obj = uuid.UUID(uuid_str)
+            uuid_obj = uuid_str if isinstance(uuid_str, uuid.UUID) else uuid.UUID(uuid_str)
             # Determine UUID version and provide appropriate analysis
             # Note: Python's uuid module doesn't natively support v2, so we need manual detection
             version = uuid_obj.version
@@ -139,22 +382,12 @@ class UUIDv1Generator:
                 timestamp = self.uuid_to_timestamp(uuid_obj)
                 # Convert UUID timestamp to Unix timestamp and handle large values
                 try:
-                    # Convert to UTC datetime (naive)
-                    dt_utc = datetime.utcfromtimestamp(timestamp)
-                    # Convert to IST (UTC+5:30)
-                    dt_ist = dt_utc + timedelta(hours=5, minutes=30)
-
-                    # Friendly formats
-                    friendly_utc = dt_utc.strftime('%A, %B %d, %Y at %I:%M:%S %p')
-                    friendly_ist = dt_ist.strftime('%A, %B %d, %Y at %I:%M:%S %p')
-
-                    # Also keep the old fields for compatibility
-                    datetime_str_utc = dt_utc.isoformat()
-                    datetime_str_ist = dt_ist.isoformat()
-                    date_str_utc = dt_utc.strftime('%Y-%m-%d')
-                    date_str_ist = dt_ist.strftime('%Y-%m-%d')
-                    time_str_utc = dt_utc.strftime('%H:%M:%S.%f')[:-3]
-                    time_str_ist = dt_ist.strftime('%H:%M:%S.%f')[:-3]
+                    # Format with gmtime + f-strings rather than datetime.strftime
+                    seconds, micros = _split_timestamp(timestamp)
+                    datetime_str_utc, date_str_utc, time_str_utc, friendly_utc = _format_timestamp_fields(seconds, micros)
+                    # IST is UTC+5:30
+                    datetime_str_ist, date_str_ist, time_str_ist, friendly_ist = _format_timestamp_fields(
+                        seconds + _IST_OFFSET_SECONDS, micros)
 
                 except (OSError, ValueError, OverflowError):
                     # Handle very large timestamps
@@ -177,9 +410,19 @@ class UUIDv1Generator:
                 time_str_utc = "N/A"
                 time_str_ist = "N/A"
 
+            # Slice the canonical 32-char hex once instead of formatting each field
+            h = uuid_obj.hex
+            time_low_hex = h[0:8]
+            time_mid_hex = h[8:12]
+            time_hi_version_hex = h[12:16]
+            time_hi_hex = '0' + h[13:16]  # version nibble cleared
+            clock_seq_hi_hex = h[16:18]
+            clock_seq_low_hex = h[18:20]
+            node_hex = h[20:32]
+
             # Extract clock sequence and variant
-            clock_seq_hi = uuid_obj.fields[3]
-            clock_seq_low = uuid_obj.fields[4]
+            clock_seq_hi = (uuid_obj.int >> 56) & 0xff
+            clock_seq_low = (uuid_obj.int >> 48) & 0xff
             clock_seq = ((clock_seq_hi & 0x3f) << 8) | clock_seq_low
             variant = clock_seq_hi >> 6
 
@@ -200,197 +443,86 @@ class UUIDv1Generator:
                 version_desc = self.get_version_description(version)
             
             # Base result with common fields
-            # For UUID v3, many fields are hash components, not actual time/clock/node values
-            # For UUID v4, all fields are random bits, not actual time/clock/node values
-            if version == 3:
-                result = {
-                    'uuid': str(uuid_obj),
-                    'timestamp': None,  # N/A for v3
-                    'datetime_utc': 'N/A',
-                    'datetime_ist': 'N/A',
-                    'date_utc': 'N/A',
-                    'date_ist': 'N/A',
-                    'time_utc': 'N/A',
-                    'time_ist': 'N/A',
-                    'friendly_utc': 'N/A - UUID v3 is name-based, not time-based',
-                    'friendly_ist': 'N/A - UUID v3 is name-based, not time-based',
-                    'timezone_utc': 'N/A',
-                    'timezone_ist': 'N/A',
-                    'version': str(version),
-                    'version_desc': version_desc,
-                    'variant': variant_desc,
-                    'variant_code': variant,
-                    'node': f"{uuid_obj.fields[5]:012x}",
-                    'node_desc': 'MD5 hash component (48 bits) - not a MAC address',
-                    'clock_seq': f"{clock_seq:04x}",
-                    'clock_seq_desc': 'MD5 hash component (14 bits) - not a clock sequence',
-                    'clock_seq_hi': f"{clock_seq_hi:02x}",
-                    'clock_seq_low': f"{clock_seq_low:02x}",
-                    'time_low': f"{uuid_obj.fields[0]:08x}",
-                    'time_mid': f"{uuid_obj.fields[1]:04x}",
-                    'time_hi': f"{uuid_obj.fields[2] & 0x0fff:04x}",
-                    'time_hi_version': f"{uuid_obj.fields[2]:04x}",
-                    'note_time_fields': 'Fields named "time_low", "time_mid", "time_hi" are MD5 hash components, not timestamps',
-                    'note_clock_node': 'Fields named "clock_seq" and "node" are MD5 hash components, not clock sequence or MAC address'
-                }
-            elif version == 4:
-                result = {
-                    'uuid': str(uuid_obj),
-                    'timestamp': None,  # N/A for v4
-                    'datetime_utc': 'N/A',
-                    'datetime_ist': 'N/A',
-                    'date_utc': 'N/A',
-                    'date_ist': 'N/A',
-                    'time_utc': 'N/A',
-                    'time_ist': 'N/A',
-                    'friendly_utc': 'N/A - UUID v4 is random, not time-based',
-                    'friendly_ist': 'N/A - UUID v4 is random, not time-based',
-                    'timezone_utc': 'N/A',
-                    'timezone_ist': 'N/A',
-                    'version': str(version),
-                    'version_desc': version_desc,
-                    'variant': variant_desc,
-                    'variant_code': variant,
-                    'node': f"{uuid_obj.fields[5]:012x}",
-                    'node_desc': 'Random bits (48 bits) - not a MAC address',
-                    'clock_seq': f"{clock_seq:04x}",
-                    'clock_seq_desc': 'Random bits (14 bits) - not a clock sequence',
-                    'clock_seq_hi': f"{clock_seq_hi:02x}",
-                    'clock_seq_low': f"{clock_seq_low:02x}",
-                    'time_low': f"{uuid_obj.fields[0]:08x}",
-                    'time_mid': f"{uuid_obj.fields[1]:04x}",
-                    'time_hi': f"{uuid_obj.fields[2] & 0x0fff:04x}",
-                    'time_hi_version': f"{uuid_obj.fields[2]:04x}",
-                    'note_time_fields': 'Fields named "time_low", "time_mid", "time_hi" are random bits, not timestamps',
-                    'note_clock_node': 'Fields named "clock_seq" and "node" are random bits, not clock sequence or MAC address'
-                }
-            else:
-                result = {
-                    'uuid': str(uuid_obj),
-                    'timestamp': timestamp,
-                    'datetime_utc': datetime_str_utc,
-                    'datetime_ist': datetime_str_ist,
-                    'date_utc': date_str_utc,
-                    'date_ist': date_str_ist,
-                    'time_utc': time_str_utc,
-                    'time_ist': time_str_ist,
-                    'friendly_utc': friendly_utc,
-                    'friendly_ist': friendly_ist,
-                    'timezone_utc': 'UTC',
-                    'timezone_ist': 'IST (UTC+5:30)',
-                    'version': str(version),
-                    'version_desc': version_desc,
-                    'variant': variant_desc,
-                    'variant_code': variant,
-                    'node': f"{uuid_obj.fields[5]:012x}",
-                    'node_desc': self.get_node_description(version),
-                    'clock_seq': f"{clock_seq:04x}",
-                    'clock_seq_desc': self.get_clock_seq_description(version),
-                    'clock_seq_hi': f"{clock_seq_hi:02x}",
-                    'clock_seq_low': f"{clock_seq_low:02x}",
-                    'time_low': f"{uuid_obj.fields[0]:08x}",
-                    'time_mid': f"{uuid_obj.fields[1]:04x}",
-                    'time_hi': f"{uuid_obj.fields[2] & 0x0fff:04x}",
-                    'time_hi_version': f"{uuid_obj.fields[2]:04x}"
-                }
+            result = {
+                'uuid': str(uuid_obj),
+                'timestamp': timestamp,
+                'datetime_utc': datetime_str_utc,
+                'datetime_ist': datetime_str_ist,
+                'date_utc': date_str_utc,
+                'date_ist': date_str_ist,
+                'time_utc': time_str_utc,
+                'time_ist': time_str_ist,
+                'friendly_utc': friendly_utc,
+                'friendly_ist': friendly_ist,
+                'timezone_utc': 'UTC',
+                'timezone_ist': 'IST (UTC+5:30)',
+                'version': str(version),
+                'version_desc': version_desc,
+                'variant': variant_desc,
+                'variant_code': variant,
+                'node': node_hex,
+                'node_desc': self.get_node_description(version),
+                'clock_seq': f"{clock_seq:04x}",
+                'clock_seq_desc': self.get_clock_seq_description(version),
+                'clock_seq_hi': clock_seq_hi_hex,
+                'clock_seq_low': clock_seq_low_hex,
+                'time_low': time_low_hex,
+                'time_mid': time_mid_hex,
+                'time_hi': time_hi_hex,
+                'time_hi_version': time_hi_version_hex
+            }
+            # For UUID v3/v4 the time/clock/node fields are hash or random bits, not real values
+            overrides = _NON_TIME_BASE_FIELDS.get(version)
+            if overrides is not None:
+                result.update(overrides)
             
             # Add version-specific fields
-            if version == 1:
-                result.update(self.get_version1_specific_fields(uuid_obj))
-            elif version == 2:
-                if possible_v2:
-                    # Enhanced analysis for possible v2 UUIDs
-                    result.update(self.get_possible_v2_specific_fields(uuid_obj))
-                else:
-                    result.update(self.get_version2_specific_fields(uuid_obj))
-            elif version == 3:
-                # Pass namespace if provided
-                result.update(self.get_version3_specific_fields(uuid_obj, namespace))
-            elif version == 4:
-                result.update(self.get_version4_specific_fields(uuid_obj))
+            if possible_v2:
+                # Enhanced analysis for possible v2 UUIDs
+                result.update(self.get_possible_v2_specific_fields(uuid_obj))
+            else:
+                builder = self._SPECIFIC_FIELD_BUILDERS.get(version)
+                if builder is not None:
+                    result.update(builder(self, uuid_obj, namespace))
             
             return result
         except ValueError:
             return {'error': 'Invalid UUID format'}
     
+    # Analysis depends only on the arguments, so repeated lookups are served from here
+    _analyze_uuid_cached = lru_cache(maxsize=8192)(_analyze_uuid_impl)
+    
     def get_version_description(self, version: int) -> str:
         """Get human-readable description for UUID version."""
-        descriptions = {
-            1: 'Time-based UUID using timestamp and MAC address',
-            2: 'DCE Security UUID (time-based + POSIX UID/GID)',
-            3: 'Name-based UUID using MD5 hash',
-            4: 'Random UUID (cryptographically secure)',
-            5: 'Name-based UUID using SHA-1 hash'
-        }
-        return descriptions.get(version, f'Unknown UUID version {version}')
+        return _VERSION_DESC.get(version, f'Unknown UUID version {version}')
     
     def is_likely_uuid_v2(self, uuid_obj: uuid.UUID) -> bool:
         """Detect if a UUID v1 might actually be a UUID v2 based on DCE Security patterns."""
-        try:
-            # UUID v2 has specific characteristics:
-            # 1. Clock sequence high byte has specific bit patterns for DCE Security
-            # 2. Node field may contain POSIX UID/GID information
-            # 3. Specific variant bits for DCE Security
-            
-            clock_seq_hi = uuid_obj.fields[3]
-            variant = clock_seq_hi >> 6
-            
-            # DCE Security typically uses variant 1 (0x40-0x7F)
-            if variant == 1:
-                # Additional checks for DCE Security patterns
-                clock_seq_low = uuid_obj.fields[4]
-                clock_seq = ((clock_seq_hi & 0x3f) << 8) | clock_seq_low
-                
-                # DCE Security UUIDs typically have clock sequences in specific ranges
-                # The clock sequence 0x0027 (39) is well within the valid range
-                if clock_seq >= 0x0001 and clock_seq <= 0x3FFF:
-                    
-                    # For DCE Security, we're more lenient with node field patterns
-                    # since they can contain various structured data
-                    node_field = uuid_obj.fields[5]
-                    
-                    # Check if this looks like a DCE Security UUID
-                    # The key indicators are:
-                    # 1. Variant 1 (DCE Security)
-                    # 2. Reasonable clock sequence range
-                    # 3. Node field that's not obviously a standard MAC address
-                    
-                    # Most importantly: if variant is 1 and clock sequence is reasonable,
-                    # this is very likely a DCE Security UUID (v2)
-                    return True
-                    
-            return False
-        except:
-            return False
+        # UUID v2 has specific characteristics:
+        # 1. Clock sequence high byte has specific bit patterns for DCE Security
+        # 2. Node field may contain POSIX UID/GID information
+        # 3. Specific variant bits for DCE Security
+        #
+        # DCE Security typically uses variant 1 (clock_seq_hi 0x40-0x7F, i.e. top bits 0b01)
+        # with a non-zero 14-bit clock sequence. Both are read straight off the 128-bit int.
+        x = uuid_obj.int
+        return (x >> 62) & 0x3 == 0b01 and (x >> 48) & 0x3fff != 0
     
     def get_node_description(self, version: int) -> str:
         """Get description for node field based on UUID version."""
-        descriptions = {
-            1: 'MAC address of the generating computer',
-            2: 'MAC address with POSIX UID/GID',
-            3: 'MD5 hash output (48 bits) - part of the hash result, not a MAC address',
-            4: 'Randomly generated (not a real MAC address)',
-            5: 'SHA-1 hash output (48 bits) - part of the hash result, not a MAC address'
-        }
-        return descriptions.get(version, 'Unknown node type')
+        return _NODE_DESC.get(version, 'Unknown node type')
     
     def get_clock_seq_description(self, version: int) -> str:
         """Get description for clock sequence based on UUID version."""
-        descriptions = {
-            1: 'Random or pseudo-random number to ensure uniqueness',
-            2: 'Security domain identifier',
-            3: 'MD5 hash output (14 bits) - part of the hash result, not a clock sequence',
-            4: 'Randomly generated (not used for timing)',
-            5: 'SHA-1 hash output (14 bits) - part of the hash result, not a clock sequence'
-        }
-        return descriptions.get(version, 'Unknown clock sequence type')
+        return _CLOCK_SEQ_DESC.get(version, 'Unknown clock sequence type')
     
     def get_version1_specific_fields(self, uuid_obj: uuid.UUID) -> Dict[str, Any]:
         """Get version 1 specific analysis fields."""
+        h = uuid_obj.hex
         return {
-            'timestamp_hex': f"{uuid_obj.fields[2]:04x}{uuid_obj.fields[1]:04x}{uuid_obj.fields[0]:08x}",
-            'mac_address': f"{uuid_obj.fields[5]:012x}",
-            'mac_address_formatted': ':'.join([f"{uuid_obj.fields[5]:012x}"[i:i+2] for i in range(0, 12, 2)]),
+            'timestamp_hex': h[12:16] + h[8:12] + h[0:8],
+            'mac_address': h[20:32],
+            'mac_address_formatted': ':'.join([h[i:i+2] for i in range(20, 32, 2)]),
             'clock_sequence_purpose': 'Prevents duplicates when system clock goes backwards',
             'time_precision': '100 nanoseconds',
             'epoch_base': 'October 15, 1582 (Gregorian calendar reform)',
@@ -406,14 +538,13 @@ class UUIDv1Generator:
     
     def get_version2_specific_fields(self, uuid_obj: uuid.UUID) -> Dict[str, Any]:
         """Get version 2 specific analysis fields."""
-        clock_seq_hi = uuid_obj.fields[3]
-        clock_seq_low = uuid_obj.fields[4]
-        clock_seq = ((clock_seq_hi & 0x3f) << 8) | clock_seq_low
+        h = uuid_obj.hex
+        clock_seq = (uuid_obj.int >> 48) & 0x3fff  # 14-bit clock sequence, variant bits dropped
         
         return {
-            'timestamp_hex': f"{uuid_obj.fields[2]:04x}{uuid_obj.fields[1]:04x}{uuid_obj.fields[0]:08x}",
+            'timestamp_hex': h[12:16] + h[8:12] + h[0:8],
             'dce_domain': self.get_dce_domain(clock_seq),
-            'posix_uid_gid': self.extract_posix_info(uuid_obj.fields[5]),
+            'posix_uid_gid': self.extract_posix_info(uuid_obj.int & 0xffffffffffff),
             'security_identifier': f"{clock_seq:04x}",
             'clock_sequence_purpose': 'DCE Security domain and POSIX UID/GID identification',
             'time_precision': '100 nanoseconds',
@@ -424,13 +555,12 @@ class UUIDv1Generator:
     def get_version3_specific_fields(self, uuid_obj: uuid.UUID, namespace: Optional[str] = None) -> Dict[str, Any]:
         """Get version 3 specific analysis fields - only showing certain/definitive data."""
         # Extract hash components (these are MD5 hash output, not time/clock/node)
-        hash_low = uuid_obj.fields[0]      # 32 bits of hash
-        hash_mid = uuid_obj.fields[1]      # 16 bits of hash
-        hash_hi = uuid_obj.fields[2] & 0x0fff  # 12 bits of hash (version bits removed)
-        clock_seq_hi = uuid_obj.fields[3]
-        clock_seq_low = uuid_obj.fields[4]
-        hash_clock = ((clock_seq_hi & 0x3f) << 8) | clock_seq_low  # 14 bits of hash
-        hash_node = uuid_obj.fields[5]     # 48 bits of hash
+        i = uuid_obj.int
+        hash_low = i >> 96                 # 32 bits of hash
+        hash_mid = (i >> 80) & 0xffff      # 16 bits of hash
+        hash_hi = (i >> 64) & 0x0fff       # 12 bits of hash (version bits removed)
+        hash_clock = (i >> 48) & 0x3fff    # 14 bits of hash (variant bits removed)
+        hash_node = i & 0xffffffffffff     # 48 bits of hash
         
         # Base result with only certain/definitive information
         result = {
@@ -451,38 +581,18 @@ class UUIDv1Generator:
         }
         
         # Only add namespace information if explicitly provided by user
-        if namespace:
-            namespace_upper = namespace.upper()
-            namespace_info = {
-                'DNS': {
-                    'uuid': str(uuid.NAMESPACE_DNS),
-                    'description': 'Domain Name System (DNS) - for domain names',
-                    'example': 'example.com'
-                },
-                'URL': {
-                    'uuid': str(uuid.NAMESPACE_URL),
-                    'description': 'Uniform Resource Locator (URL) - for URLs',
-                    'example': 'https://example.com/page'
-                },
-                'OID': {
-                    'uuid': str(uuid.NAMESPACE_OID),
-                    'description': 'ISO Object Identifier (OID) - for ISO OIDs',
-                    'example': '1.3.6.1.4.1'
-                },
-                'X500': {
-                    'uuid': str(uuid.NAMESPACE_X500),
-                    'description': 'X.500 Distinguished Name (DN) - for X.500 DNs',
-                    'example': 'CN=John Doe, OU=Engineering, O=Company'
-                }
-            }
-            
-            if namespace_upper in namespace_info:
-                result['used_namespace'] = namespace_upper
-                result['used_namespace_uuid'] = namespace_info[namespace_upper]['uuid']
-                result['used_namespace_description'] = namespace_info[namespace_upper]['description']
-            else:
-                result['used_namespace'] = namespace
-                result['used_namespace_note'] = 'Custom or unknown namespace'
+        if not namespace:
+            return result
+        
+        namespace_upper = namespace.upper()
+        info = _NAMESPACE_INFO.get(namespace_upper)
+        if info is not None:
+            result['used_namespace'] = namespace_upper
+            result['used_namespace_uuid'] = info['uuid']
+            result['used_namespace_description'] = info['description']
+        else:
+            result['used_namespace'] = namespace
+            result['used_namespace_note'] = 'Custom or unknown namespace'
         
         return result
     
@@ -503,8 +613,7 @@ class UUIDv1Generator:
         
         try:
             # Get current timestamp (100-nanosecond precision)
-            now = datetime.now()
-            timestamp_ns = int(now.timestamp() * 10000000) + 122192928000000000
+            timestamp_ns = int(time.time() * 10000000) + 122192928000000000
             
             # Extract timestamp components
             time_low = timestamp_ns & 0xFFFFFFFF
@@ -538,18 +647,18 @@ class UUIDv1Generator:
             
         except Exception as e:
             # Fallback to regular UUID v1 if v2 generation fails
-            print(f"Warning: UUID v2 generation failed: {e}, falling back to v1")
+            logger.warning("UUID v2 generation failed: %s, falling back to v1", e)
             return self.generate_uuid_v1()
     
     def get_possible_v2_specific_fields(self, uuid_obj: uuid.UUID) -> Dict[str, Any]:
         """Get enhanced analysis for possible UUID v2 cases where version bit is 1."""
-        clock_seq_hi = uuid_obj.fields[3]
-        clock_seq_low = uuid_obj.fields[4]
-        clock_seq = ((clock_seq_hi & 0x3f) << 8) | clock_seq_low
-        node_field = uuid_obj.fields[5]
+        h = uuid_obj.hex
+        i = uuid_obj.int
+        clock_seq = (i >> 48) & 0x3fff  # 14-bit clock sequence, variant bits dropped
+        node_field = i & 0xffffffffffff
         
         return {
-            'timestamp_hex': f"{uuid_obj.fields[2]:04x}{uuid_obj.fields[1]:04x}{uuid_obj.fields[0]:08x}",
+            'timestamp_hex': h[12:16] + h[8:12] + h[0:8],
             'dce_domain': self.get_dce_domain(clock_seq),
             'posix_uid_gid': self.extract_posix_info(node_field),
             'security_identifier': f"{clock_seq:04x}",
@@ -593,26 +702,12 @@ class UUIDv1Generator:
         except:
             return "Unable to extract POSIX information"
     
-    def estimate_range_size(self, start_uuid: str, end_uuid: str, 
+    def estimate_range_size(self, start_uuid: Union[str, uuid.UUID], end_uuid: Union[str, uuid.UUID], 
                            step_seconds: float = 0.0000001) -> Dict[str, Any]:
         """Estimate the size and time for UUID range generation using Ruby-like logic."""
         try:
-            start_uuid_obj = uuid.UUID(start_uuid)
-            end_uuid_obj = uuid.UUID(end_uuid)
-            
-            # Extract timestamp components exactly like Ruby code: high + mid + low
-            start_time_low = f"{start_uuid_obj.fields[0]:08x}"
-            start_time_mid = f"{start_uuid_obj.fields[1]:04x}"
-            start_time_hi = f"{start_uuid_obj.fields[2]:04x}"
-            start_timestamp_hex = int(start_time_hi[1:] + start_time_mid + start_time_low, 16)  # Remove version bit
-            
-            end_time_low = f"{end_uuid_obj.fields[0]:08x}"
-            end_time_mid = f"{end_uuid_obj.fields[1]:04x}"
-            end_time_hi = f"{end_uuid_obj.fields[2]:04x}"
-            end_timestamp_hex = int(end_time_hi[1:] + end_time_mid + end_time_low, 16)  # Remove version bit
-            
-            if start_timestamp_hex > end_timestamp_hex:
-                start_timestamp_hex, end_timestamp_hex = end_timestamp_hex, start_timestamp_hex
+            # Extract timestamps exactly like Ruby code: high + mid + low
+            start_timestamp_hex, end_timestamp_hex = _parse_range(start_uuid, end_uuid)[:2]
             
             # Calculate count exactly like Ruby: end - start + 1
             total_possible = end_timestamp_hex - start_timestamp_hex + 1
@@ -631,105 +726,66 @@ class UUIDv1Generator:
         except ValueError:
             return {'error': 'Invalid UUID format'}
 
+    # version -> builder for version-specific analysis fields (namespace is only used by v3)
+    _SPECIFIC_FIELD_BUILDERS = {
+        1: lambda self, uuid_obj, namespace: self.get_version1_specific_fields(uuid_obj),
+        2: lambda self, uuid_obj, namespace: self.get_version2_specific_fields(uuid_obj),
+        3: lambda self, uuid_obj, namespace: self.get_version3_specific_fields(uuid_obj, namespace),
+        4: lambda self, uuid_obj, namespace: self.get_version4_specific_fields(uuid_obj)
+    }
+
 class FastUUIDv1Generator:
     """Fast UUID v1 generator using direct hex manipulation like the Ruby implementation."""
     
-    def __init__(self):
-        # Get MAC address (node) - same as before
-        self.node = self._get_mac_address()
-    
-    def _get_mac_address(self):
-        """Get MAC address for the current machine."""
-        import uuid as uuid_module
-        return uuid_module.getnode()
+    # MAC address (node) of the current machine, shared with UUIDv1Generator
+    node = UUIDv1Generator.node
     
     def generate_uuid_v1_custom(self, timestamp_hex: int, clock_seq: str, mac_address: str, save_char: str) -> str:
-        """Generate a UUID v1 using the exact same logic as sandwich-irah.rb."""
-        try:
-            # Convert timestamp to hex string (same as Ruby: timestamp.to_s(16))
-            hex_str = f"{timestamp_hex:x}"
-            
-            # 60-bit timestamp = 15 hex characters
-            hex_str = hex_str.zfill(15)
-            
-            # Extract components exactly like Ruby code
-            # Ruby: high = hex[0..2], mid = hex[3..6], low = hex[7..]
-            high = hex_str[0:3]      # First 3 hex chars
-            mid = hex_str[3:7]       # Next 4 hex chars  
-            low = hex_str[7:]        # Last 8 hex chars (or whatever is left)
-            
-            # Format UUID exactly like Ruby: "#{ low }-#{ mid }-#{ save }#{ high }-#{ clock }-#{ mac }"
-            uuid_str = f"{low}-{mid}-{save_char}{high}-{clock_seq}-{mac_address}"
-            return uuid_str
-            
-        except Exception as e:
-            print(f"Error in generate_uuid_v1_custom for timestamp {timestamp_hex:x}: {e}")
-            return None
+        """Generate a UUID v1 using the exact same logic as sandwich-irah.rb.
+
+        timestamp_hex is the 60-bit UUID timestamp (0 <= timestamp_hex < 2**60), so the
+        formatting below cannot fail; callers handle errors around the whole range.
+        """
+        # Timestamp as zero-padded hex (Ruby: timestamp.to_s(16)); 60-bit timestamp = 15 hex characters
+        hex_str = f"{timestamp_hex:015x}"
+        
+        # Format UUID exactly like Ruby: "#{ low }-#{ mid }-#{ save }#{ high }-#{ clock }-#{ mac }"
+        # with high = hex[0..2], mid = hex[3..6], low = hex[7..] sliced inline
+        return f"{hex_str[7:]}-{hex_str[3:7]}-{save_char}{hex_str[0:3]}-{clock_seq}-{mac_address}"
     
     def generate_uuids_to_file_fast_with_progress(self, start_uuid, end_uuid, filename, task_id, total_possible=None):
         """Generate UUIDs to file using fast method with live progress updates and cancellation checks."""
         try:
-            # Extract timestamps using the same logic as Ruby code
-            start_uuid_obj = uuid.UUID(start_uuid)
-            end_uuid_obj = uuid.UUID(end_uuid)
-            
-            start_time_low = f"{start_uuid_obj.fields[0]:08x}"
-            start_time_mid = f"{start_uuid_obj.fields[1]:04x}"
-            start_time_hi = f"{start_uuid_obj.fields[2]:04x}"
-            start_timestamp_hex = int(start_time_hi[1:] + start_time_mid + start_time_low, 16)  # Remove version bit
-            
-            end_time_low = f"{end_uuid_obj.fields[0]:08x}"
-            end_time_mid = f"{end_uuid_obj.fields[1]:04x}"
-            end_time_hi = f"{end_uuid_obj.fields[2]:04x}"
-            end_timestamp_hex = int(end_time_hi[1:] + end_time_mid + end_time_low, 16)  # Remove version bit
-            
-            # Ensure correct order
-            if start_timestamp_hex > end_timestamp_hex:
-                start_timestamp_hex, end_timestamp_hex = end_timestamp_hex, start_timestamp_hex
+            # Extract timestamps, clock_seq and mac using the same logic as Ruby code
+            start_timestamp_hex, end_timestamp_hex, clock_seq, mac_address, save_char = _parse_range(start_uuid, end_uuid)
             
             # Calculate total if not supplied
             if total_possible is None:
                 total_possible = end_timestamp_hex - start_timestamp_hex + 1
             
-            # Extract clock_seq and mac from start UUID
-            uuid_obj = uuid.UUID(start_uuid)
-            clock_seq = f"{uuid_obj.fields[3]:02x}{uuid_obj.fields[4]:02x}"
-            mac_address = f"{uuid_obj.fields[5]:012x}"
-            save_char = f"{uuid_obj.fields[2]:04x}"[0]
-            
-            # Open file and expose path early
-            with open(filename, 'w') as f:
-                generation_tasks.get(task_id, {}).update({'file_path': filename}) if task_id in generation_tasks else None
+            # Open file (binary, WRITE_BUFFER_SIZE (8 MiB) buffer so chunk writes batch into few syscalls) and expose path early
+            with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                advise_sequential(f.fileno())
+                # Bind the task dict once; the loop polls and updates it through this local
+                task = get_task(task_id) or TaskState('fast', start_uuid, end_uuid)
+                task.file_path = filename
+                cancel = task.cancel_event
+                
+                # clock_seq, mac and newline are the same for every line
+                tail = f"-{clock_seq}-{mac_address}\n"
                 
                 count = 0
-                for current_timestamp_hex in range(start_timestamp_hex, end_timestamp_hex + 1):
-                    # Responsive cancellation check every 1000
-                    if (current_timestamp_hex - start_timestamp_hex) % 1000 == 0:
-                        if task_id in generation_tasks and generation_tasks[task_id].get('cancelled', False):
-                            try:
-                                f.flush()
-                            except Exception:
-                                pass
-                            try:
-                                if os.path.exists(filename):
-                                    os.unlink(filename)
-                            except Exception:
-                                pass
-                            return False, 'cancelled', count
+                # Format and write RANGE_CHUNK_SIZE UUIDs at a time; cancellation and progress are checked per chunk
+                for chunk_start in range(start_timestamp_hex, end_timestamp_hex + 1, RANGE_CHUNK_SIZE):
+                    if cancel.is_set():
+                        # The caller unlinks the partial file once it is closed
+                        return False, 'cancelled', count
                     
-                    try:
-                        uuid_str = self.generate_uuid_v1_custom(current_timestamp_hex, clock_seq, mac_address, save_char)
-                        if not uuid_str:
-                            continue
-                        f.write(f"{uuid_str}\n")
-                        count += 1
-                        if count % 1000 == 0:
-                            progress = min(100, (count / total_possible) * 100)
-                            if task_id in generation_tasks:
-                                generation_tasks[task_id]['progress'] = progress
-                                generation_tasks[task_id]['count'] = count
-                    except Exception:
-                        continue
+                    chunk_end = min(chunk_start + RANGE_CHUNK_SIZE, end_timestamp_hex + 1)
+                    f.write(_format_range_chunk(chunk_start, chunk_end, save_char, tail).encode('ascii'))
+                    count += chunk_end - chunk_start
+                    task.progress = min(100, (count / total_possible) * 100)
+                    task.count = count
             
             return True, 'ok', count
         except Exception as e:
@@ -739,58 +795,287 @@ class FastUUIDv1Generator:
 generator = UUIDv1Generator()
 fast_generator = FastUUIDv1Generator()
 
-# Global storage for generation tasks
-generation_tasks = {}
+class TaskState:
+    """State of one background generation task, shared by its worker thread and the API routes."""
+    
+    __slots__ = ('type', 'status', 'progress', 'count', 'start_uuid', 'end_uuid', 'total_possible',
+                 'created_at', 'cancel_event', 'cancelled', 'file_path', 'error', 'message', 'line_index',
+                 'gzip_path', 'download_name')
+    
+    # Worker-side fields left out of the status JSON
+    _INTERNAL_FIELDS = frozenset({'cancel_event', 'line_index', 'gzip_path', 'download_name'})
+    
+    def __init__(self, task_type: str, start_uuid: str, end_uuid: str, total_possible: Optional[int] = None):
+        self.type = task_type
+        self.status = 'queued'
+        self.progress = 0
+        self.count = 0
+        self.start_uuid = start_uuid
+        self.end_uuid = end_uuid
+        self.total_possible = total_possible
+        self.created_at = time.time()
+        self.cancel_event = threading.Event()
+        self.cancelled = False
+        self.file_path: Optional[str] = None
+        self.error: Optional[str] = None
+        self.message: Optional[str] = None
+        # _parse_range tuple of a completed range file, for O(1) lookups without I/O
+        self.line_index: Optional[tuple] = None
+        # Pre-compressed copy of file_path served to clients that accept gzip
+        self.gzip_path: Optional[str] = None
+        # Attachment filename, chosen on the first download and reused afterwards
+        self.download_name: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON view for the status endpoint: fields that have been set, without internal worker state."""
+        state = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if name not in self._INTERNAL_FIELDS and value is not None and value is not False:
+                state[name] = value
+        return state
+
+# Global storage for generation tasks: task_id -> TaskState, least recently used first.
+# Request threads, workers and the janitor share it; lookups, inserts, deletes and
+# iteration go through _tasks_lock.
+generation_tasks: Dict[str, TaskState] = OrderedDict()
+_tasks_lock = threading.RLock()
+
+# Tasks kept in memory; beyond this the least recently used finished tasks are dropped.
+# Their output files are already removed by cleanup_all_uuid_files on the next generation.
+MAX_TASKS = 256
+_FINISHED_STATUSES = frozenset({'completed', 'error', 'cancelled'})
+
+def get_task(task_id: str) -> Optional[TaskState]:
+    """Return the task for task_id, or None if it does not exist (or was already removed)."""
+    with _tasks_lock:
+        task = generation_tasks.get(task_id)
+        if task is not None:
+            generation_tasks.move_to_end(task_id)
+        return task
+
+def add_task(task_id: str, task: TaskState) -> None:
+    """Store a new task, evicting the least recently used finished tasks beyond MAX_TASKS."""
+    with _tasks_lock:
+        generation_tasks[task_id] = task
+        excess = len(generation_tasks) - MAX_TASKS
+        if excess > 0:
+            stale = [k for k, t in generation_tasks.items() if t.status in _FINISHED_STATUSES]
+            for k in stale[:excess]:
+                del generation_tasks[k]
+
+def _task_snapshot() -> list:
+    """Return a list of the current tasks, safe to iterate while other threads add or remove tasks."""
+    with _tasks_lock:
+        return list(generation_tasks.values())
+
+# Ranges this large are split into RANGE_SHARD_SIZE shards formatted by worker processes
+RANGE_SHARD_SIZE = 1 << 20
+PARALLEL_RANGE_MIN = 4 * RANGE_SHARD_SIZE
+
+# Output files written by the generation workers, deleted by cleanup_all_uuid_files.
+# Only the fast-path files in the working directory (and their gzip copies) are tracked;
+# range tempfiles are kept so earlier tasks stay downloadable. The working directory is
+# scanned once, on the first cleanup, for files from earlier runs.
+KNOWN_FILES: Set[str] = set()
+_known_files_lock = threading.Lock()
+_known_files_scanned = False
+
+# Path of the most recently completed generation file, used by searches without a task_id
+latest_file_path: Optional[str] = None
+
+# Cancelled tasks are dropped from memory by a single janitor thread after this many
+# seconds, so the frontend can still read their final status
+CANCELLED_TASK_TTL = 2
+# Completed and failed tasks are dropped this many seconds after their worker exits,
+# so tasks nobody cleans up don't sit in memory until MAX_TASKS evicts them
+FINISHED_TASK_TTL = int(os.getenv('FINISHED_TASK_TTL', 3600))
+# (deadline, task_id) entries, earliest deadline first since the TTLs differ
+_cleanup_queue = queue.PriorityQueue()
+_cleanup_wakeup = threading.Event()
+
+def schedule_task_removal(task_id: str, ttl: float) -> None:
+    """Have the janitor remove task_id from generation_tasks after ttl seconds."""
+    _cleanup_queue.put((time.monotonic() + ttl, task_id))
+    _cleanup_wakeup.set()
+
+def _task_janitor():
+    """Remove queued (deadline, task_id) entries from generation_tasks once the deadline passes."""
+    while True:
+        deadline, task_id = _cleanup_queue.get()
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            # Not due yet: requeue it and wait, waking early if an earlier deadline is queued
+            _cleanup_queue.put((deadline, task_id))
+            _cleanup_wakeup.wait(delay)
+            _cleanup_wakeup.clear()
+            continue
+        with _tasks_lock:
+            removed = generation_tasks.pop(task_id, None)
+        if removed is not None:
+            logger.debug("Task %s (%s) removed from memory", task_id, removed.status)
+
+threading.Thread(target=_task_janitor, daemon=True).start()
+
+# Upper bound on UUIDs accepted by /api/analyze-batch
+MAX_ANALYZE_BATCH = 1000
+
+# Generated files plus their gzip copies and interrupted compressions, for the startup scan
+_GENERATED_SUFFIXES = ('.txt', '.txt.gz', '.txt.gz.tmp')
+
+def register_uuid_file(file_path):
+    """Record a generation output file so cleanup_all_uuid_files can delete it later."""
+    with _known_files_lock:
+        KNOWN_FILES.add(file_path)
 
 def cleanup_all_uuid_files():
-    """Delete all existing UUID generation files before starting a new generation."""
+    """Delete all existing UUID generation files before starting a new generation.
+
+    Deletes the files registered by the workers; the first call also scans the
+    working directory for files left over from a previous run of the app.
+    """
+    global _known_files_scanned
     try:
-        deleted_count = 0
-        current_dir = os.getcwd()
+        with _known_files_lock:
+            file_paths = list(KNOWN_FILES)
+            KNOWN_FILES.clear()
+            if not _known_files_scanned:
+                _known_files_scanned = True
+                current_dir = os.getcwd()
+                for filename in os.listdir(current_dir):
+                    if filename.endswith(_GENERATED_SUFFIXES) and filename.startswith(('uuid_range_', 'fast_uuids_')):
+                        file_paths.append(os.path.join(current_dir, filename))
         
-        for filename in os.listdir(current_dir):
-            if filename.endswith('.txt') and (filename.startswith('uuid_range_') or filename.startswith('fast_uuids_')):
-                try:
-                    file_path = os.path.join(current_dir, filename)
-                    os.unlink(file_path)
-                    deleted_count += 1
-                except Exception:
-                    pass
+        deleted_count = 0
+        for file_path in file_paths:
+            try:
+                os.unlink(file_path)
+                deleted_count += 1
+            except Exception:
+                pass
         
         return deleted_count
     except Exception:
         return 0
 
+# Largest output file that gets a pre-compressed gzip copy; 0 disables pre-compression
+PRECOMPRESS_MAX_BYTES = int(os.getenv('PRECOMPRESS_MAX_BYTES', str(256 << 20)))
+
+def compress_generated_file(task, file_path):
+    """Write a gzip copy of a completed output file so downloads can be served pre-compressed.
+
+    Runs on the worker thread after the task is marked completed; downloads use the plain
+    file until task.gzip_path is set. Files over PRECOMPRESS_MAX_BYTES are left uncompressed.
+    """
+    try:
+        if os.path.getsize(file_path) > PRECOMPRESS_MAX_BYTES:
+            return
+    except OSError:
+        return  # Removed by a cancel before compression started
+    gz_path = file_path + '.gz'
+    tmp_path = gz_path + '.tmp'
+    try:
+        with open(file_path, 'rb') as src, gzip.open(tmp_path, 'wb', compresslevel=1) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp_path, gz_path)
+        # The copy is cleaned up together with its plain file, if that is tracked
+        with _known_files_lock:
+            if file_path in KNOWN_FILES:
+                KNOWN_FILES.add(gz_path)
+        # A cancel during compression only saw the plain file, so drop the copy here
+        with _tasks_lock:
+            keep = not task.cancel_event.is_set() and task.file_path == file_path
+            if keep:
+                task.gzip_path = gz_path
+        if not keep:
+            os.unlink(gz_path)
+    except Exception as e:
+        logger.warning("Could not pre-compress %s: %s", file_path, e)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+def _fadvise(fd, advice):
+    """Apply the named os.POSIX_FADV_* advice to the whole of fd (no-op where unsupported)."""
+    if hasattr(os, 'posix_fadvise') and hasattr(os, advice):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+def advise_sequential(fd):
+    """Hint the kernel that fd will be read or written sequentially (no-op where unsupported)."""
+    _fadvise(fd, 'POSIX_FADV_SEQUENTIAL')
+
+def release_page_cache(fd):
+    """Let the kernel drop fd's clean cached pages once a one-off scan is done."""
+    _fadvise(fd, 'POSIX_FADV_DONTNEED')
+
+def range_index_contains(line_index, line):
+    """O(1) membership test for a completed range file, without reading it.
+
+    line_index is the _parse_range tuple (start_ts, end_ts, clock_seq, mac_address, save_char).
+    A range file holds exactly one line per timestamp in [start_ts, end_ts], all sharing
+    clock_seq, mac and save_char, and those fields cover every hex digit of the UUID.
+    """
+    start_ts, end_ts, clock_seq, mac_address, save_char = line_index
+    ts, *tail = _extract_ts_and_tail(uuid.UUID(line.decode('ascii')))
+    return tail == [clock_seq, mac_address, save_char] and start_ts <= ts <= end_ts
+
+def file_contains_line(file_path, line):
+    """Return True if the file has a line exactly equal to line (bytes, without newline)."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False  # mmap cannot map an empty file
+        advise_sequential(f.fileno())
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Aggressive readahead for the mapping too (Python 3.8+, not on Windows)
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                # First line has no leading newline; last line may lack a trailing one
+                if mm.find(b"\n" + line + b"\n") != -1 or mm[:len(line) + 1] == line + b"\n":
+                    return True
+                return mm[mm.rfind(b"\n") + 1:] == line
+        finally:
+            release_page_cache(f.fileno())
+
 def generate_unique_filename(start_uuid, end_uuid):
     """Generate a unique filename for the UUID range."""
     timestamp = int(time.time())
-    # Create a hash of the UUIDs for uniqueness
-    hash_input = f"{start_uuid}_{end_uuid}_{timestamp}"
-    hash_suffix = hashlib.md5(hash_input.encode()).hexdigest()[:8]
+    # Random suffix for uniqueness
+    hash_suffix = secrets.token_hex(4)
     return f"uuid_range_{timestamp}_{hash_suffix}.txt"
 
 def generate_uuids_to_file(start_time, end_time, step_seconds, task_id):
     """Generate UUIDs to a file in an optimized way."""
+    task = get_task(task_id)
+    if task is None:
+        return
     try:
         # Delete all existing UUID files before starting generation
         cleanup_all_uuid_files()
         
         # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        temp_file = tempfile.NamedTemporaryFile(mode='wb', buffering=WRITE_BUFFER_SIZE, delete=False, suffix='.txt')
         filename = temp_file.name
         
         # Update task status
-        generation_tasks[task_id]['status'] = 'generating'
-        generation_tasks[task_id]['file_path'] = filename
+        task.status = 'generating'
+        task.file_path = filename
         
         # Optimized generation - ONLY UUIDs, no headers
         count = 0
         current_time = start_time
+        node = generator.node
+        # Lines are batched here and written once per RANGE_CHUNK_SIZE UUIDs
+        buf = bytearray()
         
         while current_time <= end_time:
             # Check for cancellation
-            if task_id in generation_tasks and generation_tasks[task_id].get('cancelled', False):
-                print(f"DEBUG: Generation cancelled for task {task_id}, stopping at count {count}")
+            if task.cancel_event.is_set():
+                logger.debug("Generation cancelled for task %s, stopping at count %d", task_id, count)
                 temp_file.close()
                 # Clean up partial file
                 try:
@@ -800,15 +1085,19 @@ def generate_uuids_to_file(start_time, end_time, step_seconds, task_id):
                 return
             
             try:
-                uuid_obj = generator.generate_uuid_v1(current_time)
-                temp_file.write(f"{uuid_obj}\n")
+                # Format the integer directly, no uuid.UUID object per iteration
+                h = f"{_uuid_v1_int(current_time, node):032x}"
+                buf += f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}\n".encode('ascii')
                 count += 1
+                if count % RANGE_CHUNK_SIZE == 0:
+                    temp_file.write(buf)
+                    buf.clear()
                 current_time += step_seconds
                 
                 # Update progress
                 progress = min(100, (count / int((end_time - start_time) / step_seconds)) * 100)
-                generation_tasks[task_id]['progress'] = progress
-                generation_tasks[task_id]['count'] = count
+                task.progress = progress
+                task.count = count
                 
                 # Small delay to prevent overwhelming the system
                 if count % 10000 == 0:
@@ -816,25 +1105,26 @@ def generate_uuids_to_file(start_time, end_time, step_seconds, task_id):
             except Exception:
                 pass
         
+        temp_file.write(buf)
         temp_file.close()
         
-        # Check for cancellation one more time before marking as complete
-        if task_id in generation_tasks and generation_tasks[task_id].get('cancelled', False):
-            print(f"DEBUG: Generation was cancelled for task {task_id}, cleaning up")
+        # Check for cancellation one more time and complete under the lock cancel_generation holds
+        with _tasks_lock:
+            cancelled = task.cancel_event.is_set()
+            if not cancelled:
+                task.progress = 100
+                task.count = count
+                task.status = 'completed'
+        if cancelled:
+            logger.debug("Generation was cancelled for task %s, cleaning up", task_id)
             try:
                 os.unlink(filename)
-            except:
+            except OSError:
                 pass
-            return
-        
-        # Update task status
-        generation_tasks[task_id]['status'] = 'completed'
-        generation_tasks[task_id]['progress'] = 100
-        generation_tasks[task_id]['count'] = count
         
     except Exception as e:
-        generation_tasks[task_id]['status'] = 'error'
-        generation_tasks[task_id]['error'] = str(e)
+        task.status = 'error'
+        task.error = str(e)
         if 'temp_file' in locals():
             temp_file.close()
             try:
@@ -842,178 +1132,218 @@ def generate_uuids_to_file(start_time, end_time, step_seconds, task_id):
             except:
                 pass
 
+def _write_shard(path, offset, shard_start, shard_end, save_char, tail):
+    """Format timestamps [shard_start, shard_end) and write them into path at byte offset.
+
+    Runs in a worker process with its own handle (and file position) on the pre-sized
+    output file; shards cover disjoint byte ranges, so workers write without locking.
+    """
+    with open(path, 'r+b', buffering=WRITE_BUFFER_SIZE) as f:
+        f.seek(offset)
+        for chunk_start in range(shard_start, shard_end, RANGE_CHUNK_SIZE):
+            f.write(_format_range_chunk(chunk_start, min(chunk_start + RANGE_CHUNK_SIZE, shard_end), save_char, tail).encode('ascii'))
+
+def _write_range_sharded(out, start_ts, end_ts, save_char, tail, task, cancel, total_possible):
+    """Format [start_ts, end_ts) in parallel shards written straight into out.
+
+    out is sized up front to hold every line and each shard is written at its own offset,
+    so there are no intermediate shard files to copy. Progress is updated and
+    cancellation checked as shards complete, in order.
+    Returns False if the task was cancelled before every shard was written.
+    """
+    base = out.tell()
+    out.truncate(base + (end_ts - start_ts) * UUID_LINE_WIDTH)
+    # Spawn rather than fork: forking a process that runs Flask and worker threads can deadlock
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(_write_shard, out.name, base + (shard_start - start_ts) * UUID_LINE_WIDTH,
+                               shard_start, min(shard_start + RANGE_SHARD_SIZE, end_ts), save_char, tail)
+                   for shard_start in range(start_ts, end_ts, RANGE_SHARD_SIZE)]
+        try:
+            for done, future in enumerate(futures, 1):
+                if cancel.is_set():
+                    return False
+                future.result()
+                
+                count = min(start_ts + done * RANGE_SHARD_SIZE, end_ts) - start_ts
+                progress = min(100, (count / total_possible) * 100)
+                task.progress = progress
+                task.count = count
+                logger.debug("Range generation progress: %.1f%% (%d/%d)", progress, count, total_possible)
+        finally:
+            # Drop shards that have not started; running ones finish before the pool exits
+            for future in futures:
+                future.cancel()
+    out.seek(0, os.SEEK_END)
+    return True
+
 def generate_range_background(start_uuid, end_uuid, task_id, total_possible):
     """Generate UUIDs in range in background with progress updates."""
+    global latest_file_path
+    task = get_task(task_id)
+    if task is None:
+        return
     try:
         # Delete all existing UUID files before starting generation
         cleanup_all_uuid_files()
         
         # Update task status
-        generation_tasks[task_id]['status'] = 'generating'
+        task.status = 'generating'
+        cancel = task.cancel_event
         
         # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+        temp_file = tempfile.NamedTemporaryFile(mode='wb', buffering=WRITE_BUFFER_SIZE, delete=False, suffix='.txt')
         filename = temp_file.name
+        advise_sequential(temp_file.fileno())
         
         # Update task with file path
-        generation_tasks[task_id]['file_path'] = filename
+        task.file_path = filename
         
         # Generate UUIDs in range
         count = 0
         
         # Use the fast UUID generation method that works correctly
         # This method generates UUIDs by manipulating hex timestamps directly
-        start_uuid_obj = uuid.UUID(start_uuid)
-        end_uuid_obj = uuid.UUID(end_uuid)
-        
-        # Extract timestamp components exactly like the fast method
-        start_time_low = f"{start_uuid_obj.fields[0]:08x}"
-        start_time_mid = f"{start_uuid_obj.fields[1]:04x}"
-        start_time_hi = f"{start_uuid_obj.fields[2]:04x}"
-        start_timestamp_hex = int(start_time_hi[1:] + start_time_mid + start_time_low, 16)  # Remove version bit
+        # Extract timestamps (ordered), clock_seq, mac and save_char (version bit) exactly like the fast method
+        start_timestamp_hex, end_timestamp_hex, clock_seq, mac_address, save_char = _parse_range(start_uuid, end_uuid)
         
-        end_time_low = f"{end_uuid_obj.fields[0]:08x}"
-        end_time_mid = f"{end_uuid_obj.fields[1]:04x}"
-        end_time_hi = f"{end_uuid_obj.fields[2]:04x}"
-        end_timestamp_hex = int(end_time_hi[1:] + end_time_mid + end_time_low, 16)  # Remove version bit
+        # clock_seq, mac and newline are the same for every line
+        tail = f"-{clock_seq}-{mac_address}\n"
         
-        # Ensure start_timestamp_hex is always less than end_timestamp_hex
-        if start_timestamp_hex > end_timestamp_hex:
-            start_timestamp_hex, end_timestamp_hex = end_timestamp_hex, start_timestamp_hex
-        
-        # Extract clock_seq and mac from start UUID
-        clock_seq = f"{start_uuid_obj.fields[3]:02x}{start_uuid_obj.fields[4]:02x}"
-        mac_address = f"{start_uuid_obj.fields[5]:012x}"
-        
-        # Extract save_char (version bit) from start UUID
-        save_char = f"{start_uuid_obj.fields[2]:04x}"[0]
+        finished = True
+        if end_timestamp_hex - start_timestamp_hex + 1 >= PARALLEL_RANGE_MIN and (os.cpu_count() or 1) > 1:
+            # Large range: format shards in worker processes, each writing its part of the file
+            finished = _write_range_sharded(temp_file, start_timestamp_hex, end_timestamp_hex + 1,
+                                            save_char, tail, task, cancel, total_possible)
+        else:
+            # Generate UUIDs for every hex timestamp in the range, one write per RANGE_CHUNK_SIZE lines
+            for chunk_start in range(start_timestamp_hex, end_timestamp_hex + 1, RANGE_CHUNK_SIZE):
+                # Check for cancellation once per batch for responsive cancellation
+                if cancel.is_set():
+                    finished = False
+                    break
+                
+                chunk_end = min(chunk_start + RANGE_CHUNK_SIZE, end_timestamp_hex + 1)
+                temp_file.write(_format_range_chunk(chunk_start, chunk_end, save_char, tail).encode('ascii'))
+                
+                # Update progress once per chunk
+                count = chunk_end - start_timestamp_hex
+                progress = min(100, (count / total_possible) * 100)
+                task.progress = progress
+                task.count = count
+                logger.debug("Range generation progress: %.1f%% (%d/%d)", progress, count, total_possible)
         
-        # Generate UUIDs for every hex timestamp in the range
-        for current_timestamp_hex in range(start_timestamp_hex, end_timestamp_hex + 1):
-            # Check for cancellation every 1000 iterations for more responsive cancellation
-            if (current_timestamp_hex - start_timestamp_hex) % 1000 == 0:
-                if task_id in generation_tasks and generation_tasks[task_id].get('cancelled', False):
-                    print(f"DEBUG: Generation cancelled for task {task_id}, stopping at count {current_timestamp_hex - start_timestamp_hex}")
-                    temp_file.close()
-                    # Clean up partial file
-                    try:
-                        os.unlink(filename)
-                    except:
-                        pass
-                    return
-            
+        if not finished:
+            logger.debug("Generation cancelled for task %s, stopping at count %d", task_id, task.count)
+            temp_file.close()
+            # Clean up partial file
             try:
-                # Generate UUID using the fast method
-                uuid_str = fast_generator.generate_uuid_v1_custom(current_timestamp_hex, clock_seq, mac_address, save_char)
-                if uuid_str:
-                    # Write UUID to file
-                    temp_file.write(f"{uuid_str}\n")
-                    
-                    # Update progress every 1000 UUIDs
-                    count = current_timestamp_hex - start_timestamp_hex + 1
-                    if count % 1000 == 0:
-                        progress = min(100, (count / total_possible) * 100)
-                        generation_tasks[task_id]['progress'] = progress
-                        generation_tasks[task_id]['count'] = count
-                        print(f"Range generation progress: {progress:.1f}% ({count:,}/{total_possible:,})")
-                        
-            except Exception as e:
-                # Silent error handling - just continue
+                os.unlink(filename)
+            except:
                 pass
+            return
         
         temp_file.close()
         
-        # Check for cancellation one more time before marking as complete
-        if task_id in generation_tasks and generation_tasks[task_id].get('cancelled', False):
-            print(f"DEBUG: Generation was cancelled for task {task_id}, cleaning up")
+        # Final cancel check and completion happen under the lock that cancel_generation
+        # holds, so a cancel either lands first (file removed here) or sees a completed task
+        with _tasks_lock:
+            cancelled = cancel.is_set()
+            if not cancelled:
+                task.line_index = (start_timestamp_hex, end_timestamp_hex, clock_seq, mac_address, save_char)
+                latest_file_path = filename
+                task.progress = 100
+                task.count = total_possible
+                task.message = f"Generated {total_possible:,} UUIDs in range"
+                task.status = 'completed'
+        if cancelled:
+            logger.debug("Generation was cancelled for task %s, cleaning up", task_id)
             try:
                 os.unlink(filename)
-            except:
+            except OSError:
                 pass
             return
         
-        # Update task status
-        generation_tasks[task_id]['status'] = 'completed'
-        generation_tasks[task_id]['progress'] = 100
-        generation_tasks[task_id]['count'] = total_possible
-        generation_tasks[task_id]['message'] = f"Generated {total_possible:,} UUIDs in range"
-        
-        print(f"Range generation completed. Count: {total_possible:,}")
+        logger.info("Range generation completed. Count: %d", total_possible)
+        compress_generated_file(task, filename)
         
     except Exception as e:
-        generation_tasks[task_id]['status'] = 'error'
-        generation_tasks[task_id]['error'] = str(e)
-        print(f"Range generation error: {e}")
+        task.status = 'error'
+        task.error = str(e)
+        logger.error("Range generation error: %s", e)
         if 'temp_file' in locals():
             temp_file.close()
             try:
                 os.unlink(filename)
             except:
                 pass
+    finally:
+        schedule_task_removal(task_id, FINISHED_TASK_TTL)
 
 def generate_uuids_fast_background(start_uuid, end_uuid, task_id):
     """Generate UUIDs using fast method in background."""
+    global latest_file_path
+    task = get_task(task_id)
+    if task is None:
+        return
     try:
         # Delete all existing UUID files before starting generation
         cleanup_all_uuid_files()
         
         # Update task status
-        generation_tasks[task_id]['status'] = 'generating'
+        task.status = 'generating'
+        cancel = task.cancel_event
         
         # Check for cancellation before starting
-        if task_id in generation_tasks and generation_tasks[task_id].get('cancelled', False):
+        if cancel.is_set():
             return
         
         # Pre-compute total_possible for progress
         try:
-            start_uuid_obj = uuid.UUID(start_uuid)
-            end_uuid_obj = uuid.UUID(end_uuid)
-            start_time_low = f"{start_uuid_obj.fields[0]:08x}"
-            start_time_mid = f"{start_uuid_obj.fields[1]:04x}"
-            start_time_hi = f"{start_uuid_obj.fields[2]:04x}"
-            start_timestamp_hex = int(start_time_hi[1:] + start_time_mid + start_time_low, 16)
-            end_time_low = f"{end_uuid_obj.fields[0]:08x}"
-            end_time_mid = f"{end_uuid_obj.fields[1]:04x}"
-            end_time_hi = f"{end_uuid_obj.fields[2]:04x}"
-            end_timestamp_hex = int(end_time_hi[1:] + end_time_mid + end_time_low, 16)
-            if start_timestamp_hex > end_timestamp_hex:
-                start_timestamp_hex, end_timestamp_hex = end_timestamp_hex, start_timestamp_hex
-            total_possible = end_timestamp_hex - start_timestamp_hex + 1
+            line_index = _parse_range(start_uuid, end_uuid)
+            total_possible = line_index[1] - line_index[0] + 1
         except Exception:
+            line_index = None
             total_possible = None
 
         filename = f"fast_uuids_{task_id}.txt"
+        register_uuid_file(os.path.abspath(filename))
         # Use the fast generator with live progress and cancellation
         success, result, count = fast_generator.generate_uuids_to_file_fast_with_progress(
             start_uuid, end_uuid, filename, task_id, total_possible
         )
         
-        # Check for cancellation after generation
-        if task_id in generation_tasks and generation_tasks[task_id].get('cancelled', False):
+        # Check for cancellation after generation (the file is closed by now) and complete
+        # under the lock that cancel_generation holds, so a cancel cannot slip in between
+        with _tasks_lock:
+            cancelled = cancel.is_set()
+            if success and not cancelled:
+                # Update task with file path and completion
+                task.file_path = os.path.abspath(filename)  # Use absolute path
+                task.line_index = line_index
+                latest_file_path = task.file_path
+                task.count = count
+                task.progress = 100
+                task.message = result
+                task.status = 'completed'
+        if cancelled:
             # Clean up the generated file
-            if os.path.exists(filename):
-                try:
-                    os.unlink(filename)
-                except:
-                    pass
+            try:
+                os.unlink(filename)
+            except OSError:
+                pass
             return
         
         if success:
-            # Update task with file path and completion
-            generation_tasks[task_id]['status'] = 'completed'
-            generation_tasks[task_id]['file_path'] = os.path.abspath(filename)  # Use absolute path
-            generation_tasks[task_id]['count'] = count
-            generation_tasks[task_id]['progress'] = 100
-            generation_tasks[task_id]['message'] = result
-            generation_tasks[task_id]['start_uuid'] = start_uuid  # Store start UUID for filename generation
-            generation_tasks[task_id]['end_uuid'] = end_uuid      # Store end UUID for filename generation
+            compress_generated_file(task, task.file_path)
         else:
-            generation_tasks[task_id]['status'] = 'error'
-            generation_tasks[task_id]['error'] = result
+            task.status = 'error'
+            task.error = result
             
     except Exception as e:
-        generation_tasks[task_id]['status'] = 'error'
-        generation_tasks[task_id]['error'] = str(e)
+        task.status = 'error'
+        task.error = str(e)
+    finally:
+        schedule_task_removal(task_id, FINISHED_TASK_TTL)
 
 @app.route('/')
 def index():
@@ -1030,15 +1360,47 @@ def analyze_uuid():
     uuid_str = data.get('uuid', '')
     namespace = data.get('namespace', None)  # Optional namespace for UUID v3
     
+    if not validate_namespace_input(namespace):
+        return jsonify({'error': f'Invalid namespace. Must be text of at most {MAX_NAMESPACE_LENGTH} characters'}), 400
+    
     if not uuid_str:
         return jsonify({'error': 'UUID is required'}), 400
     
-    # Strict UUID validation
-    if not validate_uuid(uuid_str):
+    # Strict UUID validation; the parsed object is passed on so analysis doesn't re-parse
+    uuid_obj = parse_uuid(uuid_str)
+    if uuid_obj is None:
         return jsonify({'error': 'Invalid UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'}), 400
     
-    result = generator.analyze_uuid(uuid_str, namespace=namespace)
-    return jsonify(result)
+    result = generator.analyze_uuid(uuid_obj, namespace=namespace)
+    return _json_response(result)
+
+@app.route('/api/analyze-batch', methods=['POST'])
+def analyze_uuid_batch():
+    """Analyze a list of UUIDs in one request."""
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'Invalid request data'}), 400
+    
+    uuid_list = data.get('uuids')
+    namespace = data.get('namespace', None)  # Optional namespace for UUID v3
+    
+    if not validate_namespace_input(namespace):
+        return jsonify({'error': f'Invalid namespace. Must be text of at most {MAX_NAMESPACE_LENGTH} characters'}), 400
+    if not uuid_list or not isinstance(uuid_list, list):
+        return jsonify({'error': 'A non-empty list of UUIDs is required'}), 400
+    if len(uuid_list) > MAX_ANALYZE_BATCH:
+        return jsonify({'error': f'Too many UUIDs. Maximum batch size is {MAX_ANALYZE_BATCH}'}), 400
+    
+    # Analyze in one tight loop, with per-item errors in place of invalid UUIDs
+    analyze = generator.analyze_uuid
+    results = []
+    for uuid_str in uuid_list:
+        uuid_obj = parse_uuid(uuid_str)
+        if uuid_obj is None:
+            results.append({'error': 'Invalid UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'})
+        else:
+            results.append(analyze(uuid_obj, namespace=namespace))
+    return _json_response({'results': results, 'count': len(results)})
 
 @app.route('/api/estimate', methods=['POST'])
 def estimate_range():
@@ -1053,16 +1415,20 @@ def estimate_range():
     if not start_uuid or not end_uuid:
         return jsonify({'error': 'Both start and end UUIDs are required'}), 400
     
-    # Strict UUID validation
-    if not validate_uuid(start_uuid):
+    # Strict UUID validation; parse once and hand the UUID objects downstream
+    start_u = parse_uuid(start_uuid)
+    if start_u is None:
         return jsonify({'error': 'Invalid start UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'}), 400
-    if not validate_uuid(end_uuid):
+    end_u = parse_uuid(end_uuid)
+    if end_u is None:
         return jsonify({'error': 'Invalid end UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'}), 400
+    if not (is_valid_range_endpoint(start_u) and is_valid_range_endpoint(end_u)):
+        return jsonify({'error': 'Start and end UUIDs must be version 1 UUIDs'}), 400
     
     # Use a realistic default time step (100 nanoseconds = UUID's natural precision)
     step_seconds = 0.0000001  # 100 nanoseconds
     
-    result = generator.estimate_range_size(start_uuid, end_uuid, step_seconds)
+    result = generator.estimate_range_size(start_u, end_u, step_seconds)
     return jsonify(result)
 
 @app.route('/api/generate-range', methods=['POST'])
@@ -1078,54 +1444,31 @@ def generate_range():
     if not start_uuid or not end_uuid:
         return jsonify({'error': 'Both start and end UUIDs are required'}), 400
     
-    # Strict UUID validation
-    if not validate_uuid(start_uuid):
+    # Strict UUID validation; parse once and hand the UUID objects downstream
+    start_u = parse_uuid(start_uuid)
+    if start_u is None:
         return jsonify({'error': 'Invalid start UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'}), 400
-    if not validate_uuid(end_uuid):
+    end_u = parse_uuid(end_uuid)
+    if end_u is None:
         return jsonify({'error': 'Invalid end UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'}), 400
-    
-    try:
-        start_uuid_obj = uuid.UUID(start_uuid)
-        end_uuid_obj = uuid.UUID(end_uuid)
-    except ValueError:
-        return jsonify({'error': 'Invalid UUID format'}), 400
+    if not (is_valid_range_endpoint(start_u) and is_valid_range_endpoint(end_u)):
+        return jsonify({'error': 'Start and end UUIDs must be version 1 UUIDs'}), 400
     
     # Calculate total possible UUIDs in range using hex timestamps
-    # Extract timestamp components from UUIDs
-    start_time_low = f"{start_uuid_obj.fields[0]:08x}"
-    start_time_mid = f"{start_uuid_obj.fields[1]:04x}"
-    start_time_hi = f"{start_uuid_obj.fields[2]:04x}"
-    start_timestamp_hex = int(start_time_hi[1:] + start_time_mid + start_time_low, 16)
-    
-    end_time_low = f"{end_uuid_obj.fields[0]:08x}"
-    end_time_mid = f"{end_uuid_obj.fields[1]:04x}"
-    end_time_hi = f"{end_uuid_obj.fields[2]:04x}"
-    end_timestamp_hex = int(end_time_hi[1:] + end_time_mid + end_time_low, 16)
-    
-    if start_timestamp_hex > end_timestamp_hex:
-        start_timestamp_hex, end_timestamp_hex = end_timestamp_hex, start_timestamp_hex
+    start_timestamp_hex, end_timestamp_hex = _parse_range(start_u, end_u)[:2]
     
     total_possible = end_timestamp_hex - start_timestamp_hex + 1
     
     # Create unique task ID for this generation
-    task_id = hashlib.md5(f"range_{start_uuid}_{end_uuid}_{time.time()}".encode()).hexdigest()
+    task_id = secrets.token_hex(16)
     
     # Initialize task
-    generation_tasks[task_id] = {
-        'status': 'queued',
-        'progress': 0,
-        'count': 0,
-        'start_uuid': start_uuid,
-        'end_uuid': end_uuid,
-        'total_possible': total_possible,
-        'created_at': time.time(),
-        'type': 'range'
-    }
+    add_task(task_id, TaskState('range', start_uuid, end_uuid, total_possible))
     
     # Start generation in background thread
     thread = threading.Thread(
         target=generate_range_background,
-        args=(start_uuid, end_uuid, task_id, total_possible)
+        args=(start_u, end_u, task_id, total_possible)
     )
     thread.daemon = True
     thread.start()
@@ -1174,26 +1517,20 @@ def generate_single():
                 return jsonify({'error': f'Invalid namespace. Must be one of: DNS, URL, OID, X500'}), 400
             
             # Map namespace string to UUID namespace
-            namespace_map = {
-                'DNS': uuid.NAMESPACE_DNS,
-                'URL': uuid.NAMESPACE_URL,
-                'OID': uuid.NAMESPACE_OID,
-                'X500': uuid.NAMESPACE_X500
-            }
-            
-            namespace_uuid = namespace_map[namespace_str]
+            namespace_uuid = _NAMESPACE_UUIDS[namespace_str]
             uuid_obj = uuid.uuid3(namespace_uuid, name)
         elif version == '4':
             uuid_obj = uuid.uuid4()
         else:
             return jsonify({'error': f'Unsupported UUID version: {version}'}), 400
         
-        result = generator.analyze_uuid(str(uuid_obj), namespace=namespace_str if version == '3' else None)
+        # Fresh v1/v4 UUIDs never repeat, so don't let them fill the analysis cache
+        result = generator.analyze_uuid(uuid_obj, namespace=namespace_str if version == '3' else None, cache=False)
         result['version'] = version
         if version == '3':
             result['name'] = name
             result['namespace_uuid'] = str(namespace_uuid)
-        return jsonify(result)
+        return _json_response(result)
         
     except Exception as e:
         return jsonify({'error': f'Failed to generate UUID v{version}: {str(e)}'}), 500
@@ -1212,31 +1549,27 @@ def generate_range_fast():
     if not start_uuid or not end_uuid:
         return jsonify({'error': 'Both start and end UUIDs are required'}), 400
     
-    # Strict UUID validation
-    if not validate_uuid(start_uuid):
+    # Strict UUID validation; parse once and hand the UUID objects downstream
+    start_u = parse_uuid(start_uuid)
+    if start_u is None:
         return jsonify({'error': 'Invalid start UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'}), 400
-    if not validate_uuid(end_uuid):
+    end_u = parse_uuid(end_uuid)
+    if end_u is None:
         return jsonify({'error': 'Invalid end UUID format. UUID must be in format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'}), 400
+    if not (is_valid_range_endpoint(start_u) and is_valid_range_endpoint(end_u)):
+        return jsonify({'error': 'Start and end UUIDs must be version 1 UUIDs'}), 400
     
     try:
         # Create unique task ID
-        task_id = hashlib.md5(f"fast_{start_uuid}_{end_uuid}_{time.time()}".encode()).hexdigest()
+        task_id = secrets.token_hex(16)
         
         # Initialize task
-        generation_tasks[task_id] = {
-            'status': 'queued',
-            'progress': 0,
-            'count': 0,
-            'start_uuid': start_uuid,
-            'end_uuid': end_uuid,
-            'created_at': time.time(),
-            'type': 'fast'
-        }
+        add_task(task_id, TaskState('fast', start_uuid, end_uuid))
         
         # Start generation in background thread
         thread = threading.Thread(
             target=generate_uuids_fast_background,
-            args=(start_uuid, end_uuid, task_id)
+            args=(start_u, end_u, task_id)
         )
         thread.daemon = True
         thread.start()
@@ -1253,7 +1586,7 @@ def generate_range_fast():
 
 @app.route('/api/search-uuid', methods=['POST'])
 def search_uuid_in_file():
-    """Search for a specific UUID in a generated file using fast grep."""
+    """Search for a specific UUID in a generated file, via its line index or an mmap scan if unindexed."""
     data = request.get_json()
     task_id = data.get('task_id', '')
     search_uuid = data.get('search_uuid', '')
@@ -1266,32 +1599,31 @@ def search_uuid_in_file():
         return jsonify({'error': 'Invalid UUID format'}), 400
     
     file_path = None
+    line_index = None
     
     # If task_id provided, use it; otherwise find the latest generated file
     if task_id:
-        if task_id not in generation_tasks:
+        task = get_task(task_id)
+        if task is None:
             return jsonify({'error': 'Task not found'}), 404
         
-        task = generation_tasks[task_id]
-        if task['status'] != 'completed':
+        if task.status != 'completed':
             return jsonify({'error': 'Task not completed yet'}), 400
         
-        file_path = task.get('file_path')
+        file_path = task.file_path
+        line_index = task.line_index
+    elif latest_file_path and os.path.exists(latest_file_path):
+        # Latest file recorded by the generation workers, with the line index of its task
+        file_path = latest_file_path
+        line_index = next((t.line_index for t in _task_snapshot()
+                           if t.file_path == file_path and t.line_index is not None), None)
     else:
-        # Find the latest generated UUID file
-        current_dir = os.getcwd()
-        uuid_files = []
-        
-        for filename in os.listdir(current_dir):
-            if filename.endswith('.txt') and (filename.startswith('uuid_range_') or filename.startswith('fast_uuids_')):
-                file_path_full = os.path.join(current_dir, filename)
-                if os.path.isfile(file_path_full):
-                    uuid_files.append((file_path_full, os.path.getmtime(file_path_full)))
-        
-        if uuid_files:
-            # Sort by modification time (newest first) and get the latest
-            uuid_files.sort(key=lambda x: x[1], reverse=True)
-            file_path = uuid_files[0][0]
+        # Latest completed task that has an output file, by creation time (no directory scan)
+        completed = [t for t in _task_snapshot() if t.status == 'completed' and t.file_path]
+        if completed:
+            latest = max(completed, key=lambda t: t.created_at)
+            file_path = latest.file_path
+            line_index = latest.line_index
         else:
             return jsonify({'error': 'No generated UUID files found'}), 404
     
@@ -1303,15 +1635,17 @@ def search_uuid_in_file():
         if not validate_uuid(search_uuid):
             return jsonify({'error': 'Invalid UUID format'}), 400
         
-        # For very large files, use optimized grep with early exit
-        # -F: fixed string (faster than regex)
-        # -x: exact line match
-        # -m 1: stop after first match (much faster for large files)
-        import subprocess
-        result = subprocess.run(['grep', '-Fxm', '1', search_uuid, file_path], 
-                              capture_output=True, text=True, timeout=60)
+        # Generated files hold canonical lowercase UUIDs, so normalise the query the same way
+        needle = search_uuid.strip().lower().encode('ascii')
+        
+        # Completed range files are answered from their line index with no I/O.
+        # Otherwise fall back to an exact line match over a read-only mmap of the file.
+        if line_index is not None:
+            found = range_index_contains(line_index, needle)
+        else:
+            found = file_contains_line(file_path, needle)
         
-        if result.returncode == 0 and result.stdout.strip():
+        if found:
             # UUID found
             return jsonify({
                 'found': True,
@@ -1326,94 +1660,103 @@ def search_uuid_in_file():
                 'message': 'UUID not found in the generated file'
             })
             
-    except subprocess.TimeoutExpired:
-        return jsonify({'error': 'Search timed out - file may be too large'}), 408
     except Exception as e:
         return jsonify({'error': f'Search failed: {str(e)}'}), 500
 
 @app.route('/api/generation-status/<task_id>', methods=['GET'])
 def get_generation_status(task_id):
     """Get the status of a generation task."""
-    if task_id not in generation_tasks:
+    task = get_task(task_id)
+    if task is None:
         return jsonify({'error': 'Task not found'}), 404
     
-    task = generation_tasks[task_id]
-    return jsonify(task)
+    # The cancel event is worker-side state, not part of the JSON status
+    return jsonify(task.to_dict())
 
 @app.route('/api/download-file/<task_id>', methods=['GET'])
 def download_generated_file(task_id):
     """Download the generated UUID file - file is kept after download."""
-    if task_id not in generation_tasks:
+    task = get_task(task_id)
+    if task is None:
         return jsonify({'error': 'Task not found'}), 404
     
-    task = generation_tasks[task_id]
-    
-    if task.get('status') != 'completed':
+    if task.status != 'completed':
         return jsonify({'error': 'File not ready yet'}), 400
     
-    file_path = task.get('file_path')
+    file_path = task.file_path
     if not file_path or not os.path.exists(file_path):
         return jsonify({'error': 'Generated file not found'}), 404
     
     try:
-        start_uuid = task.get('start_uuid', 'start')
-        end_uuid = task.get('end_uuid', 'end')
-        filename = generate_unique_filename(start_uuid, end_uuid)
+        if task.download_name is None:
+            task.download_name = generate_unique_filename(task.start_uuid or 'start', task.end_uuid or 'end')
+        filename = task.download_name
         
-        return send_file(
-            file_path,
+        # Serve the pre-compressed copy as-is to clients that accept gzip
+        gzip_path = task.gzip_path
+        use_gzip = bool(gzip_path) and request.accept_encodings['gzip'] > 0 and os.path.exists(gzip_path)
+        served_path = gzip_path if use_gzip else file_path
+        
+        # Conditional responses (ETag/Last-Modified, Range) let clients resume large downloads
+        response = send_file(
+            served_path,
             as_attachment=True,
             download_name=filename,
-            mimetype='text/plain'
+            mimetype='text/plain',
+            conditional=True,
+            etag=True,
+            last_modified=os.path.getmtime(served_path)
         )
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
     except Exception as e:
         return jsonify({'error': f'Download failed: {str(e)}'}), 500
 
 @app.route('/api/cleanup-task/<task_id>', methods=['DELETE'])
 def cleanup_task(task_id):
     """Clean up a completed task from memory (file is NOT deleted)."""
-    if task_id not in generation_tasks:
-        return jsonify({'error': 'Task not found'}), 404
-    
-    task = generation_tasks[task_id]
-    
     # Remove task from memory only - file is kept
-    del generation_tasks[task_id]
+    with _tasks_lock:
+        task = generation_tasks.pop(task_id, None)
+    if task is None:
+        return jsonify({'error': 'Task not found'}), 404
     
     return jsonify({'message': 'Task removed from memory (file preserved)'})
 
 @app.route('/api/cancel-generation/<task_id>', methods=['POST'])
 def cancel_generation(task_id):
     """Cancel a running generation task and clean up files."""
-    if task_id not in generation_tasks:
-        return jsonify({'error': 'Task not found'}), 404
-    
-    task = generation_tasks[task_id]
-    
     try:
-        # Mark task as cancelled
-        task['status'] = 'cancelled'
-        task['error'] = 'Generation cancelled by user'
-        task['cancelled'] = True  # Add cancellation flag
+        # Mark task as cancelled under the lock; file I/O happens outside it
+        with _tasks_lock:
+            task = generation_tasks.get(task_id)
+            if task is None:
+                return jsonify({'error': 'Task not found'}), 404
+            # A running worker still has its file open; it unlinks the partial
+            # file itself after closing it. Only finished tasks are cleaned here.
+            if task.status in ('completed', 'error'):
+                file_paths = [p for p in (task.file_path, task.gzip_path) if p]
+            else:
+                file_paths = []
+            task.status = 'cancelled'
+            task.error = 'Generation cancelled by user'
+            task.cancelled = True  # Add cancellation flag
+            task.cancel_event.set()  # Wake the worker's per-chunk check
         
-        # Clean up any existing files
-        if 'file_path' in task and os.path.exists(task['file_path']):
+        # Clean up files left by a finished task
+        for file_path in file_paths:
             try:
-                os.unlink(task['file_path'])
-                print(f"DEBUG: Cancelled task file deleted: {task['file_path']}")
-            except Exception as e:
-                print(f"DEBUG: Error deleting cancelled task file: {e}")
+                os.unlink(file_path)
+                logger.debug("Cancelled task file deleted: %s", file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Error deleting cancelled task file: %s", e)
         
         # Remove task from memory after a short delay to allow frontend to get status
-        def cleanup_task():
-            time.sleep(2)  # Wait 2 seconds for frontend to get final status
-            if task_id in generation_tasks:
-                del generation_tasks[task_id]
-                print(f"DEBUG: Cancelled task {task_id} removed from memory")
-        
-        cleanup_thread = threading.Thread(target=cleanup_task)
-        cleanup_thread.daemon = True
-        cleanup_thread.start()
+        schedule_task_removal(task_id, CANCELLED_TASK_TTL)
         
         return jsonify({
             'message': 'Generation cancelled successfully',
@@ -1427,4 +1770,5 @@ if __name__ == '__main__':
     import os
     debug_mode = os.getenv('FLASK_ENV', 'development') == 'development'
     port = int(os.getenv('PORT', 5001))
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
     app.run(debug=debug_mode, host='0.0.0.0', port=port) 
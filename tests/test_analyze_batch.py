@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the /api/analyze-batch endpoint.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, generator, MAX_ANALYZE_BATCH
+
+V1_UUID = "0867d7ee-f8d5-11ef-8a38-aedb2c11800f"
+V4_UUID = "6f1c0e52-3f0a-4c8e-9d2b-7a5e1b3c9f40"
+
+def _post(payload):
+    return app.test_client().post('/api/analyze-batch', json=payload)
+
+def test_mixed_batch():
+    """Valid UUIDs are analyzed in place; every bad slot gets its own error dict."""
+    uuids = [V1_UUID, "not-a-uuid", V4_UUID.upper(), 12345, None, ["x"], {"uuid": V1_UUID}]
+    response = _post({'uuids': uuids})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == len(uuids)
+    results = data['results']
+    assert len(results) == len(uuids)
+    
+    assert results[0] == generator.analyze_uuid(V1_UUID)
+    assert results[2]['uuid'] == V4_UUID
+    for bad in (1, 3, 4, 5, 6):
+        assert set(results[bad]) == {'error'}, results[bad]
+
+def test_batch_limit():
+    """At most MAX_ANALYZE_BATCH UUIDs are accepted per request."""
+    assert _post({'uuids': [V1_UUID] * MAX_ANALYZE_BATCH}).status_code == 200
+    response = _post({'uuids': [V1_UUID] * (MAX_ANALYZE_BATCH + 1)})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_batch_requires_list():
+    """Missing, empty or non-list 'uuids' is rejected."""
+    for payload in ({}, {'uuids': []}, {'uuids': V1_UUID}):
+        assert _post(payload).status_code == 400
+
+def test_batch_namespace():
+    """Unhashable or oversized namespaces are rejected instead of reaching the cache."""
+    assert _post({'uuids': [V1_UUID], 'namespace': {'a': 1}}).status_code == 400
+    assert _post({'uuids': [V1_UUID], 'namespace': ['DNS']}).status_code == 400
+    assert _post({'uuids': [V1_UUID], 'namespace': 'x' * 100000}).status_code == 400
+    assert _post({'uuids': [V1_UUID], 'namespace': 'DNS'}).status_code == 200
+
+if __name__ == "__main__":
+    test_mixed_batch()
+    test_batch_limit()
+    test_batch_requires_list()
+    test_batch_namespace()
+    print("Analyze batch tests passed")
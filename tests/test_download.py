@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for serving generated files, plain or pre-compressed.
+"""
+
+import sys
+import os
+import gzip
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app
+from app import TaskState, add_task, compress_generated_file, _parse_range, _format_range_chunk
+
+START_UUID = "0867d7ee-f8d5-11ef-8a38-aedb2c11800f"
+END_UUID = "0867e7ee-f8d5-11ef-8a38-aedb2c11800f"
+
+def _completed_task(task_id):
+    """Write a small range file and register a completed task for it."""
+    start_ts, end_ts, clock_seq, mac_address, save_char = _parse_range(START_UUID, END_UUID)
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+        f.write(_format_range_chunk(start_ts, end_ts + 1, save_char, f"-{clock_seq}-{mac_address}\n").encode('ascii'))
+    task = TaskState('range', START_UUID, END_UUID)
+    task.status = 'completed'
+    task.file_path = f.name
+    add_task(task_id, task)
+    return task
+
+def _remove_files(task):
+    for path in (task.file_path, task.gzip_path, task.file_path + '.gz'):
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+def _download(task_id, accept_encoding):
+    response = app.app.test_client().get(f'/api/download-file/{task_id}',
+                                         headers={'Accept-Encoding': accept_encoding})
+    assert response.status_code == 200, response.get_json()
+    data = response.data
+    response.close()
+    return response, data
+
+def test_gzip_and_identity_downloads():
+    """Clients accepting gzip get the pre-compressed copy; others get the plain file."""
+    task = _completed_task('test-download-gzip')
+    try:
+        with open(task.file_path, 'rb') as f:
+            plain = f.read()
+        compress_generated_file(task, task.file_path)
+        assert task.gzip_path and os.path.exists(task.gzip_path)
+        
+        response, data = _download('test-download-gzip', 'gzip, deflate')
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert gzip.decompress(data) == plain
+        
+        response, data = _download('test-download-gzip', 'identity')
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert data == plain
+    finally:
+        _remove_files(task)
+
+def test_plain_file_without_gzip_copy():
+    """Before compression finishes, or above PRECOMPRESS_MAX_BYTES, the plain file is served."""
+    task = _completed_task('test-download-plain')
+    saved = app.PRECOMPRESS_MAX_BYTES
+    try:
+        with open(task.file_path, 'rb') as f:
+            plain = f.read()
+        
+        # Compression still running: gzip_path is not set yet
+        response, data = _download('test-download-plain', 'gzip')
+        assert 'Content-Encoding' not in response.headers
+        assert data == plain
+        
+        # File over the pre-compression limit never gets a copy
+        app.PRECOMPRESS_MAX_BYTES = len(plain) - 1
+        compress_generated_file(task, task.file_path)
+        assert task.gzip_path is None and not os.path.exists(task.file_path + '.gz')
+        response, data = _download('test-download-plain', 'gzip')
+        assert 'Content-Encoding' not in response.headers
+        assert data == plain
+    finally:
+        app.PRECOMPRESS_MAX_BYTES = saved
+        _remove_files(task)
+
+def test_cancel_during_compression_removes_gzip():
+    """A cancel that arrives while the copy is being written leaves no .gz behind."""
+    task = _completed_task('test-download-cancel')
+    copyfileobj = app.shutil.copyfileobj
+    
+    def cancel_then_copy(src, dst, length=0):
+        response = app.app.test_client().post('/api/cancel-generation/test-download-cancel')
+        assert response.status_code == 200
+        return copyfileobj(src, dst, length)
+    
+    app.shutil.copyfileobj = cancel_then_copy
+    try:
+        compress_generated_file(task, task.file_path)
+    finally:
+        app.shutil.copyfileobj = copyfileobj
+        gz_path = task.file_path + '.gz'
+        gz_left = os.path.exists(gz_path)
+        _remove_files(task)
+    assert task.status == 'cancelled'
+    assert task.gzip_path is None
+    assert not gz_left
+
+if __name__ == "__main__":
+    test_gzip_and_identity_downloads()
+    test_plain_file_without_gzip_copy()
+    test_cancel_during_compression_removes_gzip()
+    print("Download tests passed")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the parallel range writer.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app
+from app import TaskState, add_task, get_task, generate_range_background, _parse_range, _format_range_chunk
+
+START_UUID = "0867d7ee-f8d5-11ef-8a38-aedb2c11800f"
+END_UUID = "086cd7ee-f8d5-11ef-8a38-aedb2c11800f"
+
+def _run_sharded(task_id, cancelled=False):
+    """Run generate_range_background with small shards so the parallel path is taken."""
+    start_ts, end_ts = _parse_range(START_UUID, END_UUID)[:2]
+    total_possible = end_ts - start_ts + 1
+    task = TaskState('range', START_UUID, END_UUID, total_possible)
+    if cancelled:
+        task.cancel_event.set()
+    add_task(task_id, task)
+    
+    saved = app.RANGE_SHARD_SIZE, app.PARALLEL_RANGE_MIN, os.cpu_count
+    # Unaligned shards so shard edges fall inside 2**16 formatting blocks
+    app.RANGE_SHARD_SIZE = (1 << 16) + 12345
+    app.PARALLEL_RANGE_MIN = 1
+    os.cpu_count = lambda: 2
+    try:
+        generate_range_background(START_UUID, END_UUID, task_id, total_possible)
+    finally:
+        app.RANGE_SHARD_SIZE, app.PARALLEL_RANGE_MIN, os.cpu_count = saved
+    return task
+
+def test_sharded_range_matches_formatter():
+    """Shards written in place must be byte-identical to formatting the whole range."""
+    start_ts, end_ts, clock_seq, mac_address, save_char = _parse_range(START_UUID, END_UUID)
+    expected = _format_range_chunk(start_ts, end_ts + 1, save_char, f"-{clock_seq}-{mac_address}\n").encode('ascii')
+    
+    task = _run_sharded('test-sharded')
+    try:
+        assert task.status == 'completed', task.error
+        assert task.count == end_ts - start_ts + 1
+        with open(task.file_path, 'rb') as f:
+            assert f.read() == expected
+    finally:
+        for path in (task.file_path, task.gzip_path):
+            if path and os.path.exists(path):
+                os.unlink(path)
+
+def test_sharded_range_cancel_removes_file():
+    """A cancelled sharded generation leaves no output file behind."""
+    task = _run_sharded('test-sharded-cancel', cancelled=True)
+    assert task.status != 'completed'
+    assert task.file_path and not os.path.exists(task.file_path)
+
+def _wait_for_files(task_id):
+    """Wait until the task has completed and its gzip copy is written; return the task."""
+    task = get_task(task_id)
+    for _ in range(200):
+        if task.status == 'completed' and task.gzip_path:
+            break
+        time.sleep(0.05)
+    assert task.status == 'completed', task.error
+    return task
+
+def test_consecutive_generations_keep_earlier_download():
+    """Starting a second range generation must not delete the first task's file."""
+    client = app.app.test_client()
+    task_ids, tasks = [], []
+    try:
+        for end_uuid in (END_UUID, "0869d7ee-f8d5-11ef-8a38-aedb2c11800f"):
+            response = client.post('/api/generate-range', json={'start_uuid': START_UUID, 'end_uuid': end_uuid})
+            assert response.status_code == 200, response.get_json()
+            task_ids.append(response.get_json()['task_id'])
+            tasks.append(_wait_for_files(task_ids[-1]))
+        
+        response = client.get(f'/api/download-file/{task_ids[0]}', headers={'Accept-Encoding': 'identity'})
+        assert response.status_code == 200, response.get_json()
+        start_ts, end_ts = _parse_range(START_UUID, END_UUID)[:2]
+        assert len(response.data) == (end_ts - start_ts + 1) * app.UUID_LINE_WIDTH
+        response.close()
+    finally:
+        for task in tasks:
+            for path in (task.file_path, task.gzip_path):
+                if path and os.path.exists(path):
+                    os.unlink(path)
+
+if __name__ == "__main__":
+    test_sharded_range_matches_formatter()
+    test_sharded_range_cancel_removes_file()
+    test_consecutive_generations_keep_earlier_download()
+    print("Range generation tests passed")
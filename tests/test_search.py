@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for /api/search-uuid on generated range files.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, TaskState, add_task, range_index_contains, _parse_range, _format_range_chunk
+
+START_UUID = "0867d7ee-f8d5-11ef-8a38-aedb2c11800f"
+END_UUID = "0867e7ee-f8d5-11ef-8a38-aedb2c11800f"
+
+def _line(ts):
+    """The UUID a range file built from START_UUID holds for timestamp ts."""
+    clock_seq, mac_address, save_char = _parse_range(START_UUID, END_UUID)[2:]
+    return _format_range_chunk(ts, ts + 1, save_char, f"-{clock_seq}-{mac_address}\n").strip()
+
+def _completed_task(task_id, indexed):
+    """Write the range file for START_UUID..END_UUID and register a completed task for it."""
+    line_index = _parse_range(START_UUID, END_UUID)
+    start_ts, end_ts, clock_seq, mac_address, save_char = line_index
+    with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+        f.write(_format_range_chunk(start_ts, end_ts + 1, save_char, f"-{clock_seq}-{mac_address}\n").encode('ascii'))
+    task = TaskState('range', START_UUID, END_UUID)
+    task.status = 'completed'
+    task.file_path = f.name
+    task.line_index = line_index if indexed else None
+    add_task(task_id, task)
+    return task
+
+def _search(client, task_id, search_uuid):
+    response = client.post('/api/search-uuid', json={'task_id': task_id, 'search_uuid': search_uuid})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['found']
+
+def test_range_index_contains():
+    """Index lookups cover exactly [start_ts, end_ts] with the range's clock_seq and MAC."""
+    line_index = _parse_range(START_UUID, END_UUID)
+    start_ts, end_ts = line_index[:2]
+    
+    assert range_index_contains(line_index, _line(start_ts).encode('ascii'))
+    assert range_index_contains(line_index, _line(start_ts + 0x100).encode('ascii'))
+    assert range_index_contains(line_index, _line(end_ts).encode('ascii'))
+    
+    # Timestamps just outside both ends
+    assert not range_index_contains(line_index, _line(start_ts - 1).encode('ascii'))
+    assert not range_index_contains(line_index, _line(end_ts + 1).encode('ascii'))
+    
+    # In-range timestamp with a foreign clock_seq or MAC
+    hit = _line(start_ts + 0x100)
+    assert not range_index_contains(line_index, (hit[:19] + '8a39' + hit[23:]).encode('ascii'))
+    assert not range_index_contains(line_index, (hit[:24] + 'aedb2c11800e').encode('ascii'))
+
+def _check_search(indexed):
+    task_id = 'test-search-indexed' if indexed else 'test-search-mmap'
+    task = _completed_task(task_id, indexed)
+    if indexed:
+        # Indexed lookups must not read the file, so leave nothing in it to find
+        open(task.file_path, 'wb').close()
+    start_ts, end_ts = _parse_range(START_UUID, END_UUID)[:2]
+    hit = _line(start_ts + 0x100)
+    try:
+        client = app.test_client()
+        assert _search(client, task_id, hit)
+        assert _search(client, task_id, START_UUID)
+        assert _search(client, task_id, END_UUID)
+        # Uppercase and padded queries are normalised to the file's canonical form
+        assert _search(client, task_id, hit.upper())
+        assert _search(client, task_id, f"  {hit}\n")
+        
+        assert not _search(client, task_id, _line(start_ts - 1))
+        assert not _search(client, task_id, _line(end_ts + 1))
+        assert not _search(client, task_id, hit[:19] + '8a39' + hit[23:])
+        assert not _search(client, task_id, hit[:24] + 'aedb2c11800e')
+    finally:
+        os.unlink(task.file_path)
+
+def test_search_uses_line_index():
+    """Searches on an indexed task are answered from the line index."""
+    _check_search(indexed=True)
+
+def test_search_mmap_fallback():
+    """Tasks without a line index fall back to scanning the file."""
+    _check_search(indexed=False)
+
+if __name__ == "__main__":
+    test_range_index_contains()
+    test_search_uses_line_index()
+    test_search_mmap_fallback()
+    print("Search tests passed")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory task registry: LRU eviction and TTL removal.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app
+from app import TaskState, add_task, get_task, schedule_task_removal, generate_range_background, _parse_range
+
+START_UUID = "0867d7ee-f8d5-11ef-8a38-aedb2c11800f"
+END_UUID = "0867dfee-f8d5-11ef-8a38-aedb2c11800f"
+
+def _task(status):
+    task = TaskState('fast', START_UUID, END_UUID)
+    task.status = status
+    return task
+
+def _wait_removed(task_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while task_id in app.generation_tasks and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return task_id not in app.generation_tasks
+
+def test_lru_evicts_finished_tasks_only():
+    """Beyond MAX_TASKS the least recently used finished tasks go; running tasks stay."""
+    saved_tasks, saved_max = app.generation_tasks.copy(), app.MAX_TASKS
+    app.generation_tasks.clear()
+    app.MAX_TASKS = 3
+    try:
+        add_task('running', _task('generating'))
+        add_task('done-1', _task('completed'))
+        add_task('done-2', _task('error'))
+        # Touching done-1 makes done-2 the least recently used finished task
+        assert get_task('done-1') is not None
+        assert list(app.generation_tasks) == ['running', 'done-2', 'done-1']
+        
+        add_task('done-3', _task('cancelled'))
+        assert list(app.generation_tasks) == ['running', 'done-1', 'done-3']
+        
+        # Only running tasks left to keep: the registry grows past MAX_TASKS instead
+        app.generation_tasks.clear()
+        for i in range(4):
+            add_task(f'running-{i}', _task('generating'))
+        assert len(app.generation_tasks) == 4
+    finally:
+        app.generation_tasks.clear()
+        app.generation_tasks.update(saved_tasks)
+        app.MAX_TASKS = saved_max
+
+def test_janitor_honours_earliest_deadline():
+    """A short TTL queued behind a long one is still removed on time."""
+    add_task('ttl-long', _task('completed'))
+    add_task('ttl-short', _task('cancelled'))
+    schedule_task_removal('ttl-long', 3600)
+    schedule_task_removal('ttl-short', 0.05)
+    try:
+        assert _wait_removed('ttl-short', timeout=2)
+        assert 'ttl-long' in app.generation_tasks
+    finally:
+        app.generation_tasks.pop('ttl-long', None)
+
+def test_finished_task_removed_after_ttl():
+    """A completed generation is dropped from memory FINISHED_TASK_TTL seconds after its worker exits."""
+    start_ts, end_ts = _parse_range(START_UUID, END_UUID)[:2]
+    total_possible = end_ts - start_ts + 1
+    task = TaskState('range', START_UUID, END_UUID, total_possible)
+    add_task('ttl-worker', task)
+    
+    saved_ttl = app.FINISHED_TASK_TTL
+    app.FINISHED_TASK_TTL = 0.1
+    try:
+        generate_range_background(START_UUID, END_UUID, 'ttl-worker', total_possible)
+        assert task.status == 'completed', task.error
+        assert _wait_removed('ttl-worker')
+    finally:
+        app.FINISHED_TASK_TTL = saved_ttl
+        for path in (task.file_path, task.gzip_path):
+            if path and os.path.exists(path):
+                os.unlink(path)
+
+if __name__ == "__main__":
+    test_lru_evicts_finished_tasks_only()
+    test_janitor_honours_earliest_deadline()
+    test_finished_task_removed_after_ttl()
+    print("Task registry tests passed")
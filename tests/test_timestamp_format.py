@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script pinning the analysis date/time strings to the datetime/strftime output they replaced.
+"""
+
+import sys
+import os
+import warnings
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import generator, _split_timestamp, _format_timestamp_fields, _IST_OFFSET_SECONDS
+
+def _strftime_fields(dt):
+    """(isoformat, date, time, friendly) exactly as the datetime-based analysis produced them."""
+    return (dt.isoformat(), dt.strftime('%Y-%m-%d'), dt.strftime('%H:%M:%S.%f')[:-3],
+            dt.strftime('%A, %B %d, %Y at %I:%M:%S %p'))
+
+def _check(timestamp):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)  # utcfromtimestamp on Python 3.12+
+        dt_utc = datetime.utcfromtimestamp(timestamp)
+    dt_ist = dt_utc + timedelta(hours=5, minutes=30)
+    
+    seconds, micros = _split_timestamp(timestamp)
+    assert _format_timestamp_fields(seconds, micros) == _strftime_fields(dt_utc), timestamp
+    assert _format_timestamp_fields(seconds + _IST_OFFSET_SECONDS, micros) == _strftime_fields(dt_ist), timestamp
+
+def test_microsecond_rounding():
+    """Fractions that round up to a whole second carry into the seconds, like datetime."""
+    for timestamp in (1.9999996, 59.9999995, 1700000000.9999999, 0.0000005, 0.0000015,
+                      1741219200.123456, 1741219200.1234565, 1741219200.5):
+        _check(timestamp)
+
+def test_dates_before_1970():
+    """Negative timestamps, back to the 1582 UUID epoch."""
+    for timestamp in (-0.0000004, -0.25, -1.9999996, -86400.75, -1000000000.5,
+                      -12219292800.0, -12219292800 + 0.0000001, -12219292800 + 86399.9999996):
+        _check(timestamp)
+
+def test_twelve_hour_clock():
+    """Midnight and noon are 12 AM / 12 PM; other hours follow %I %p."""
+    for hour in (0, 1, 11, 12, 13, 23):
+        for timestamp in (hour * 3600, hour * 3600 + 3599.999):
+            _check(timestamp)
+    # IST crosses noon and midnight half an hour after UTC
+    for timestamp in (6 * 3600 + 29 * 60, 6 * 3600 + 30 * 60, 18 * 3600 + 30 * 60 - 0.001, 18 * 3600 + 30 * 60):
+        _check(timestamp)
+
+def test_analyze_uuid_time_fields():
+    """End to end: analysis of a v1 UUID reports the strftime-formatted fields."""
+    result = generator.analyze_uuid("0867d7ee-f8d5-11ef-8a38-aedb2c11800f")
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        dt_utc = datetime.utcfromtimestamp(result['timestamp'])
+    iso_str, date_str, time_str, friendly = _strftime_fields(dt_utc)
+    assert (result['datetime_utc'], result['date_utc'], result['time_utc'], result['friendly_utc']) == \
+        (iso_str, date_str, time_str, friendly)
+
+if __name__ == "__main__":
+    test_microsecond_rounding()
+    test_dates_before_1970()
+    test_twelve_hour_clock()
+    test_analyze_uuid_time_fields()
+    print("Timestamp format tests passed")
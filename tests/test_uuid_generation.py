@@ -71,21 +71,24 @@ def test_uuid_generation():
     current_time = start_time
     count = 0
     max_count = 100  # Limit for testing
+    lines = []
     
     while current_time <= end_time and count < max_count:
         generated_uuid = generator.generate_uuid_v1(current_time)
         generated_timestamp = generator.uuid_to_timestamp(generated_uuid)
         
-        print(f"Time: {current_time:.9f} -> UUID: {generated_uuid} -> Timestamp: {generated_timestamp:.9f}")
+        lines.append(f"Time: {current_time:.9f} -> UUID: {generated_uuid} -> Timestamp: {generated_timestamp:.9f}")
         
         current_time += step_seconds
         count += 1
         
         # Check if we generated the missing UUID
         if str(generated_uuid) == missing_uuid:
-            print(f"✓ Found missing UUID at iteration {count}!")
+            lines.append(f"✓ Found missing UUID at iteration {count}!")
             break
     
+    # One write for the whole trace instead of a print per UUID
+    print("\n".join(lines))
     print(f"\nGenerated {count} UUIDs in range")
 
 if __name__ == "__main__":
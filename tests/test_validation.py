@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script to verify strict input validation.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import validate_uuid, parse_uuid
+import uuid
+
+def test_validate_uuid():
+    """Test strict UUID validation."""
+
+    # Canonical UUIDs (any case, surrounding whitespace stripped)
+    assert validate_uuid("0867d7ee-f8d5-11ef-8a38-aedb2c11800f")
+    assert validate_uuid("0867D7EE-F8D5-11EF-8A38-AEDB2C11800F")
+    assert validate_uuid(" 0867d7ee-f8d5-11ef-8a38-aedb2c11800f\n")
+
+    # Forms accepted by uuid.UUID but not by the strict validator
+    assert not validate_uuid("0867d7eef8d511ef8a38aedb2c11800f")
+    assert not validate_uuid("{0867d7ee-f8d5-11ef-8a38-aedb2c11800f}")
+    assert not validate_uuid("+867d7ee-f8d5-11ef-8a38-aedb2c11800f")
+    assert not validate_uuid("08_7d7ee-f8d5-11ef-8a38-aedb2c11800f")
+    assert not validate_uuid("٠867d7ee-f8d5-11ef-8a38-aedb2c11800f")
+
+    # Malformed input
+    assert not validate_uuid("")
+    assert not validate_uuid(None)
+    assert not validate_uuid("0867d7ee-f8d5-11ef-8a38-aedb2c11800g")
+    assert not validate_uuid("0867d7ee-f8d5-11ef-8a38+aedb2c11800f")
+    assert not validate_uuid("0867d7ee-f8d5-11ef-8a38-aedb2c11800f0")
+
+def test_parse_uuid():
+    """Test that parse_uuid returns the parsed UUID or None."""
+    assert parse_uuid(" 0867D7EE-F8D5-11EF-8A38-AEDB2C11800F ") == uuid.UUID("0867d7ee-f8d5-11ef-8a38-aedb2c11800f")
+    assert parse_uuid("{0867d7ee-f8d5-11ef-8a38-aedb2c11800f}") is None
+    assert parse_uuid(None) is None
+
+if __name__ == "__main__":
+    test_validate_uuid()
+    test_parse_uuid()
+    print("Validation tests passed")